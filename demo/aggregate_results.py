@@ -0,0 +1,442 @@
+"""Aggregate Locust, Playwright and mock-server results into one report.
+
+Inputs are streamed: Locust ``*_stats_history.csv`` files are read row by
+row, so multi-gigabyte soak-test histories never have to fit in memory.
+Latencies go into log-bucketed histograms that merge by adding bucket
+counts. That allows several Locust runs, workers or endpoints to be
+combined without keeping raw samples. Locust only records a handful of
+percentile points per row, so latency distributions rebuilt from its CSVs
+are approximations.
+
+Run Locust with ``--csv-full-history`` to get per-endpoint series and
+per-window percentiles. Without it the history holds only ``Aggregated``
+rows whose percentiles are cumulative over the run; those files still give
+per-window request counts, but latency only for the run as a whole.
+
+Usage:
+    python aggregate_results.py --out summary.json [--report report.md] [--window 10]
+        [--locust run_stats_history.csv ...] [--playwright results.json ...]
+        [--server profile.json ...]
+
+Playwright results must come from the JSON reporter
+(``npx playwright test --reporter=json > results.json``); server data is the
+``--profile`` report written by mock-api-server.py.
+"""
+import csv
+import json
+import math
+import sys
+from datetime import datetime, timezone
+
+DEFAULT_WINDOW_SECONDS = 10
+PERCENTILES = (50, 90, 95, 99)
+
+# Locust history percentile columns and the fraction of requests at or below each
+LOCUST_PERCENTILE_COLUMNS = (
+    ('50%', 0.50), ('66%', 0.66), ('75%', 0.75), ('80%', 0.80), ('90%', 0.90),
+    ('95%', 0.95), ('98%', 0.98), ('99%', 0.99), ('99.9%', 0.999),
+    ('99.99%', 0.9999), ('100%', 1.0),
+)
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (milliseconds) with ``precision`` relative error.
+
+    Histograms with the same precision merge by adding bucket counts, so
+    percentiles can be combined across windows, files and endpoints.
+    """
+
+    def __init__(self, precision=0.01):
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.buckets = {}
+        self.count = 0.0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value, count=1.0):
+        if count <= 0:
+            return
+        value = max(float(value), 0.001)
+        index = math.ceil(math.log(value) / self._log_base)
+        self.buckets[index] = self.buckets.get(index, 0.0) + count
+        self.count += count
+        self.total += value * count
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge histograms with different precision")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0.0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, q):
+        if not self.count:
+            return None
+        target = self.count * q / 100
+        seen = 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= target:
+                return min((1 + self.precision) ** index, self.max)
+        return self.max
+
+    def summary(self):
+        result = {
+            'count': round(self.count),
+            'mean_ms': round(self.total / self.count, 2) if self.count else None,
+            'max_ms': round(self.max, 2) if self.count else None,
+        }
+        for p in PERCENTILES:
+            value = self.percentile(p)
+            result[f'p{p}_ms'] = round(value, 2) if value is not None else None
+        return result
+
+    def to_dict(self):
+        """Serializable form, so trend tooling can keep merging later runs."""
+        return {'precision': self.precision, 'buckets': {str(k): v for k, v in sorted(self.buckets.items())}}
+
+
+class Series:
+    """Requests, failures and latency for one named series, overall and per time window."""
+
+    def __init__(self):
+        self.overall = LatencyHistogram()
+        self.failures = 0.0
+        # window start -> [latency histogram, failures, requests, first covered second, last covered second]
+        self.windows = {}
+
+    def _bucket(self, window):
+        bucket = self.windows.get(window)
+        if bucket is None:
+            bucket = self.windows[window] = [LatencyHistogram(), 0.0, 0.0, math.inf, -math.inf]
+        return bucket
+
+    def add(self, window, latency_ms, count=1.0, failures=0.0):
+        self.overall.add(latency_ms, count)
+        self.failures += failures
+        bucket = self._bucket(window)
+        bucket[0].add(latency_ms, count)
+        bucket[1] += failures
+        bucket[2] += count
+
+    def add_requests(self, window, count, failures=0.0):
+        """Count requests in a window whose latencies are not known per window."""
+        self.failures += failures
+        bucket = self._bucket(window)
+        bucket[1] += failures
+        bucket[2] += count
+
+    def cover(self, window, start, end):
+        """Record that the window's requests were observed between ``start`` and ``end``."""
+        bucket = self._bucket(window)
+        bucket[3] = min(bucket[3], start)
+        bucket[4] = max(bucket[4], end)
+
+    def summary(self):
+        result = self.overall.summary()
+        result['failures'] = round(self.failures)
+        result['error_rate'] = round(self.failures / self.overall.count, 4) if self.overall.count else None
+        return result
+
+
+class Aggregator:
+    def __init__(self, window_seconds=DEFAULT_WINDOW_SECONDS):
+        self.window_seconds = window_seconds
+        self.series = {}
+        self.server = {}
+
+    def _window(self, timestamp):
+        return int(timestamp // self.window_seconds * self.window_seconds)
+
+    def _cover(self, series, window, start, end):
+        # Edge windows are only partly covered by a run; clamp so rps uses the covered part.
+        series.cover(window, max(start, window), min(end, window + self.window_seconds))
+
+    def _series(self, source, name):
+        key = (source, name)
+        if key not in self.series:
+            self.series[key] = Series()
+        return self.series[key]
+
+    def add_locust_history(self, path):
+        """Fold a Locust ``*_stats_history.csv`` into the histograms; returns the requests added.
+
+        With ``--csv-full-history`` each per-endpoint row carries cumulative
+        counters and the percentiles of the window just finished. The
+        requests added since the previous row of the same endpoint are spread
+        over those percentile points.
+
+        Without it only ``Aggregated`` rows exist, and their percentiles are
+        cumulative, so see ``_add_locust_aggregated_history``.
+        """
+        with open(path, newline='') as f:
+            full_history = any(row.get('Name', 'Aggregated') != 'Aggregated' for row in csv.DictReader(f))
+        if not full_history:
+            return self._add_locust_aggregated_history(path)
+
+        added = 0.0
+        previous = {}
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                name = row.get('Name', '')
+                if name == 'Aggregated' or not row.get('Timestamp'):
+                    continue
+                key = (row.get('Type', ''), name)
+                timestamp = float(row['Timestamp'])
+                total = float(row.get('Total Request Count') or 0)
+                failed = float(row.get('Total Failure Count') or 0)
+                prev_total, prev_failed, prev_timestamp = previous.get(key, (0.0, 0.0, timestamp))
+                previous[key] = (total, failed, timestamp)
+                new_requests = total - prev_total
+                if new_requests <= 0:
+                    continue
+
+                series = self._series('locust', f'{key[0]} {name}'.strip())
+                window = self._window(timestamp)
+                self._cover(series, window, prev_timestamp, timestamp)
+                new_failures = max(failed - prev_failed, 0.0)
+                added += new_requests
+                for value, share in _percentile_slices(row, new_requests):
+                    # Failures are attributed to the first slice so the totals stay exact.
+                    series.add(window, value, share, new_failures)
+                    new_failures = 0.0
+        return added
+
+    def _add_locust_aggregated_history(self, path):
+        """Requests per window from ``Aggregated`` rows, latency from the last row.
+
+        The percentiles of these rows are cumulative over the run, so only
+        the final row describes the run's latency; it is spread over the
+        overall histogram once, while the windows get request counts only.
+        """
+        series = None
+        last = None
+        prev_total = prev_failed = 0.0
+        prev_timestamp = None
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                if not row.get('Timestamp'):
+                    continue
+                timestamp = float(row['Timestamp'])
+                total = float(row.get('Total Request Count') or 0)
+                failed = float(row.get('Total Failure Count') or 0)
+                new_requests = total - prev_total
+                new_failures = max(failed - prev_failed, 0.0)
+                since = timestamp if prev_timestamp is None else prev_timestamp
+                prev_total, prev_failed, prev_timestamp = total, failed, timestamp
+                if new_requests <= 0:
+                    continue
+                if series is None:
+                    series = self._series('locust', 'Aggregated')
+                window = self._window(timestamp)
+                series.add_requests(window, new_requests, new_failures)
+                self._cover(series, window, since, timestamp)
+                last = row
+
+        if last is None:
+            return 0.0
+        for value, share in _percentile_slices(last, prev_total):
+            series.overall.add(value, share)
+        return prev_total
+
+    def add_playwright_report(self, path):
+        """Fold a Playwright JSON report into the histograms; returns the results added."""
+        with open(path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        added = 0
+
+        def walk(suite):
+            nonlocal added
+            for spec in suite.get('specs', []):
+                for test in spec.get('tests', []):
+                    for result in test.get('results', []):
+                        if result.get('status') == 'skipped' or 'startTime' not in result:
+                            continue
+                        started = datetime.fromisoformat(result['startTime'].replace('Z', '+00:00')).timestamp()
+                        failed = 0.0 if result.get('status') == 'passed' else 1.0
+                        series = self._series('playwright', spec.get('title', 'unnamed'))
+                        window = self._window(started)
+                        series.add(window, result.get('duration', 0), 1.0, failed)
+                        self._cover(series, window, started, started + result.get('duration', 0) / 1000)
+                        added += 1
+            for child in suite.get('suites', []):
+                walk(child)
+
+        for suite in report.get('suites', []):
+            walk(suite)
+        return added
+
+    def add_server_profile(self, path):
+        """Add a mock-server profile's stage timings; returns the number of stages."""
+        with open(path, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+        for stage, stats in profile.get('stages', {}).items():
+            entry = self.server.setdefault(stage, {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'max_wall_s': 0.0})
+            entry['calls'] += stats.get('calls', 0)
+            entry['wall_s'] += stats.get('wall_s', 0.0)
+            entry['cpu_s'] += stats.get('cpu_s', 0.0)
+            entry['max_wall_s'] = max(entry['max_wall_s'], stats.get('max_wall_s', 0.0))
+        return len(profile.get('stages', {}))
+
+    def summary(self):
+        sources = {}
+        for (source, name), series in sorted(self.series.items()):
+            merged = sources.setdefault(source, {'overall': Series(), 'series': {}})
+            merged['overall'].overall.merge(series.overall)
+            merged['overall'].failures += series.failures
+            merged['series'][name] = series.summary()
+
+        timeline = {}
+        for (source, name), series in self.series.items():
+            for window, (histogram, failures, requests, first, last) in series.windows.items():
+                slot = timeline.setdefault(window, {}).setdefault(source, [LatencyHistogram(), 0.0, 0.0, math.inf, -math.inf])
+                slot[0].merge(histogram)
+                slot[1] += failures
+                slot[2] += requests
+                slot[3] = min(slot[3], first)
+                slot[4] = max(slot[4], last)
+
+        return {
+            'window_seconds': self.window_seconds,
+            'sources': {
+                source: {
+                    'overall': data['overall'].summary(),
+                    'histogram': data['overall'].overall.to_dict(),
+                    'series': data['series'],
+                }
+                for source, data in sources.items()
+            },
+            'timeline': [
+                {
+                    'start': window,
+                    **{
+                        source: {
+                            'requests': round(requests),
+                            'rps': round(requests / _covered(first, last), 2),
+                            'covered_s': round(_covered(first, last), 2),
+                            'partial': last - first < self.window_seconds,
+                            'failures': round(failures),
+                            # None when the input only had cumulative percentiles
+                            'p95_ms': round(histogram.percentile(95), 2) if histogram.count else None,
+                        }
+                        for source, (histogram, failures, requests, first, last) in sorted(slots.items())
+                    },
+                }
+                for window, slots in sorted(timeline.items())
+            ],
+            'server': {
+                stage: {**stats, 'mean_ms': round(stats['wall_s'] / stats['calls'] * 1000, 3) if stats['calls'] else None}
+                for stage, stats in sorted(self.server.items())
+            },
+        }
+
+
+def _covered(first, last):
+    """Seconds a window was observed for; at least one, so a single sample is not read as a burst."""
+    return max(last - first, 1.0)
+
+
+def _percentile_slices(row, requests):
+    """Yield ``(latency ms, request share)`` spreading ``requests`` over a Locust row's percentile columns."""
+    below = 0.0
+    for column, fraction in LOCUST_PERCENTILE_COLUMNS:
+        value = row.get(column)
+        if value in (None, '', 'N/A'):
+            continue
+        yield float(value), (fraction - below) * requests
+        below = fraction
+
+
+def _cell(value):
+    return '-' if value is None else f'{value:g}' if isinstance(value, float) else str(value)
+
+
+def render_report(summary):
+    lines = ['# Test Run Summary', '']
+    for source, data in summary['sources'].items():
+        lines += [f'## {source.title()}', '',
+                  '| Name | Count | Failures | Error rate | p50 ms | p95 ms | p99 ms | Max ms |',
+                  '|------|------:|---------:|-----------:|-------:|-------:|-------:|-------:|']
+        rows = list(data['series'].items()) + [('**All**', data['overall'])]
+        for name, stats in rows:
+            lines.append('| {} | {} | {} | {} | {} | {} | {} | {} |'.format(
+                name, stats['count'], stats['failures'], _cell(stats['error_rate']),
+                _cell(stats['p50_ms']), _cell(stats['p95_ms']), _cell(stats['p99_ms']), _cell(stats['max_ms'])))
+        lines.append('')
+
+    if summary['server']:
+        lines += ['## Mock Server', '', '| Stage | Calls | Mean ms | Max ms |', '|-------|------:|--------:|-------:|']
+        for stage, stats in summary['server'].items():
+            lines.append(f"| {stage} | {stats['calls']} | {_cell(stats['mean_ms'])} | {stats['max_wall_s'] * 1000:.3f} |")
+        lines.append('')
+
+    if summary['timeline']:
+        sources = sorted(summary['sources'])
+        lines += [f"## Timeline ({summary['window_seconds']}s windows)", '',
+                  '| Window (UTC) | ' + ' | '.join(f'{s} rps | {s} p95 ms | {s} failures' for s in sources) + ' |',
+                  '|---' * (1 + 3 * len(sources)) + '|']
+        for slot in summary['timeline']:
+            cells = [datetime.fromtimestamp(slot['start'], timezone.utc).strftime('%Y-%m-%d %H:%M:%S')]
+            for source in sources:
+                stats = slot.get(source)
+                rps = _cell(stats['rps']) + ('*' if stats['partial'] else '') if stats else '-'
+                cells += [rps, _cell(stats['p95_ms']), _cell(stats['failures'])] if stats else ['-', '-', '-']
+            lines.append('| ' + ' | '.join(cells) + ' |')
+        lines += ['', '\\* partial window: rps is over the seconds it was observed for', '']
+
+    return '\n'.join(lines)
+
+
+def main(out_path, report_path=None, window=DEFAULT_WINDOW_SECONDS, locust=(), playwright=(), server=()):
+    aggregator = Aggregator(window)
+    inputs = (
+        [(path, aggregator.add_locust_history) for path in locust]
+        + [(path, aggregator.add_playwright_report) for path in playwright]
+        + [(path, aggregator.add_server_profile) for path in server]
+    )
+    contributed = 0
+    for path, add in inputs:
+        if add(path):
+            contributed += 1
+        else:
+            print(f"Warning: {path} contained no results", file=sys.stderr)
+    if not contributed:
+        print("Warning: nothing to aggregate, no summary written", file=sys.stderr)
+        return
+
+    summary = aggregator.summary()
+    with open(out_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    print(f"Summary written to {out_path}")
+
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(render_report(summary))
+        print(f"Report written to {report_path}")
+
+if __name__ == "__main__":
+    options = {'out_path': None, 'report_path': None, 'window': DEFAULT_WINDOW_SECONDS,
+               'locust': [], 'playwright': [], 'server': []}
+    it = iter(sys.argv[1:])
+    for arg in it:
+        if arg == '--out':
+            options['out_path'] = next(it, None)
+        elif arg == '--report':
+            options['report_path'] = next(it, None)
+        elif arg == '--window':
+            options['window'] = float(next(it, DEFAULT_WINDOW_SECONDS))
+        elif arg in ('--locust', '--playwright', '--server'):
+            options[arg[2:]].append(next(it, None))
+        else:
+            options['out_path'] = None
+            break
+    if not options['out_path'] or not (options['locust'] or options['playwright'] or options['server']):
+        print("Usage: python aggregate_results.py --out <summary.json> [--report <report.md>] [--window <seconds>] "
+              "[--locust <stats_history.csv> ...] [--playwright <results.json> ...] [--server <profile.json> ...]")
+        sys.exit(1)
+    main(**options)
@@ -0,0 +1,335 @@
+"""Find the highest request rate each operation sustains within its SLO.
+
+The controller runs a generated locustfile headless at a series of arrival
+rates. Each operation is isolated in turn by keeping only its task. At each
+level it reads Locust's final stats CSV and checks:
+
+* the error rate against ``--max-error-rate``,
+* latency percentiles against the locustfile's ``SLOS`` table (written by
+  swagger_to_locust.py / postman_to_locust.py from ``x-slo``), falling back
+  to ``--slo``,
+* the achieved throughput, which must reach ``1 - --tolerance`` of the
+  target; falling short means requests are queueing.
+
+``--mode binary`` (the default) doubles the rate until a level fails and
+then bisects between the last passing and first failing levels. ``--mode
+step`` adds ``--step`` requests/s per level and stops at the first failure.
+
+Arrival rate is driven by giving every simulated user a
+``constant_throughput`` wait time, so the rate does not depend on latency
+until the target stops responding in time.
+
+Usage:
+    python capacity_search.py <locustfile.py> [--host http://localhost:5000]
+        [--mode binary|step] [--start 10] [--step 10] [--max-rps 5000]
+        [--step-time 15] [--precision 0.1] [--max-error-rate 0.01]
+        [--tolerance 0.1] [--slo p95=200ms] [--max-users 200] [--processes N]
+        [--operation <task name> ...] [--mixed] [--csv-dir <dir>] [--out capacity.json]
+"""
+import ast
+import csv
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from slo import parse_slo
+
+DEFAULTS = {
+    'host': 'http://localhost:5000',
+    'mode': 'binary',
+    'start': 10.0,
+    'step': 10.0,
+    'max_rps': 5000.0,
+    'step_time': 15,
+    'precision': 0.1,
+    'max_error_rate': 0.01,
+    'tolerance': 0.1,
+    'slo': None,
+    'max_users': 200,
+    'processes': None,
+    'operations': [],
+    'mixed': False,
+    'csv_dir': None,
+    'out': None,
+}
+
+# Imported by Locust in place of the scenario: it loads the generated
+# locustfile, pins every user's arrival rate and optionally keeps one task.
+WRAPPER = '''import importlib.util
+import os
+
+from locust import User, constant_throughput
+
+_spec = importlib.util.spec_from_file_location('capacity_scenario', os.environ['CAPACITY_LOCUSTFILE'])
+_scenario = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_scenario)
+
+for _name, _value in vars(_scenario).items():
+    if not (isinstance(_value, type) and issubclass(_value, User)) or _value.__module__ != 'capacity_scenario':
+        continue
+    _value.wait_time = constant_throughput(float(os.environ['CAPACITY_RATE_PER_USER']))
+    if os.environ.get('CAPACITY_TASK'):
+        _value.tasks = [t for t in _value.tasks if getattr(t, '__name__', None) == os.environ['CAPACITY_TASK']]
+    if _value.tasks:
+        globals()[_name] = _value
+# Locust collects every User class in this module, loop variable included
+del _name, _value
+'''
+
+# Stats CSV column for each SLO key other than pNN
+SLO_COLUMNS = {'max': 'Max Response Time', 'avg': 'Average Response Time'}
+
+
+def read_scenario(locustfile):
+    """Return ``(task names, SLOS table)`` parsed from a locustfile without importing it."""
+    with open(locustfile, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), locustfile)
+
+    tasks = []
+    slos = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef):
+            for decorator in node.decorator_list:
+                target = decorator.func if isinstance(decorator, ast.Call) else decorator
+                if getattr(target, 'id', getattr(target, 'attr', None)) == 'task':
+                    tasks.append(node.name)
+        elif isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == 'SLOS' for t in node.targets):
+            slos = {tuple(key): parse_slo(value) for key, value in ast.literal_eval(node.value).items()}
+    return tasks, slos
+
+
+def _column(key):
+    return SLO_COLUMNS.get(key, f'{key[1:]}%')
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _tail(path, lines=20):
+    try:
+        with open(path, errors='replace') as f:
+            return ''.join(f.readlines()[-lines:])
+    except OSError:
+        return ''
+
+
+def read_stats(path):
+    """Rows of a Locust ``*_stats.csv`` keyed by ``(name, method)``; the total is keyed ``None``."""
+    rows = {}
+    if not os.path.exists(path):
+        return rows
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            key = None if row.get('Name') == 'Aggregated' else (row.get('Name'), row.get('Type'))
+            rows[key] = row
+    return rows
+
+
+class CapacitySearch:
+    def __init__(self, locustfile, options):
+        self.locustfile = os.path.abspath(locustfile)
+        self.options = options
+        self.tasks, self.slos = read_scenario(locustfile)
+        self.default_slo = parse_slo(options['slo'])
+        self.csv_dir = options['csv_dir'] or tempfile.mkdtemp(prefix='capacity-')
+        os.makedirs(self.csv_dir, exist_ok=True)
+        self.wrapper = os.path.join(self.csv_dir, 'capacity_locustfile.py')
+        with open(self.wrapper, 'w') as f:
+            f.write(WRAPPER)
+
+    def close(self):
+        if not self.options['csv_dir']:
+            shutil.rmtree(self.csv_dir, ignore_errors=True)
+
+    def run_level(self, label, task, rate):
+        """Run Locust at ``rate`` requests/s for one step and return its stats rows."""
+        users = max(1, min(math.ceil(rate), self.options['max_users']))
+        prefix = os.path.join(self.csv_dir, f'{label}_{rate:g}')
+        command = [
+            sys.executable, '-m', 'locust', '-f', self.wrapper, '--headless',
+            '-u', str(users), '-r', str(users), '-t', f"{self.options['step_time']}s",
+            '-H', self.options['host'], '--csv', prefix, '--reset-stats', '--only-summary',
+        ]
+        if self.options['processes']:
+            command += ['--processes', str(self.options['processes'])]
+        env = dict(os.environ, CAPACITY_LOCUSTFILE=self.locustfile,
+                   CAPACITY_RATE_PER_USER=str(rate / users), CAPACITY_TASK=task or '')
+        with open(prefix + '.log', 'w') as log:
+            returncode = subprocess.run(command, env=env, stdout=log, stderr=subprocess.STDOUT).returncode
+        rows = read_stats(prefix + '_stats.csv')
+        # Exit code 1 only means failed requests or the scenario's own SLO check, which
+        # the stats decide here; anything else (or no stats at all) means Locust never ran.
+        if returncode not in (0, 1) or not rows:
+            problem = f'exited with code {returncode}' if returncode not in (0, 1) else 'wrote no stats'
+            raise RuntimeError(f"Locust {problem} at {rate:g}/s for {label}; "
+                               f"last lines of {prefix}.log:\n{_tail(prefix + '.log')}")
+        return rows
+
+    def evaluate(self, rows, rate):
+        """Return ``(passed, per-operation results)`` for one level."""
+        results = {}
+        passed = bool(rows)
+        for key, row in rows.items():
+            if key is None:
+                continue
+            name, method = key
+            count = _number(row.get('Request Count')) or 0
+            failures = _number(row.get('Failure Count')) or 0
+            result = {
+                'rps': round(_number(row.get('Requests/s')) or 0, 2),
+                'error_rate': round(failures / count, 4) if count else None,
+                'p50_ms': _number(row.get('50%')),
+                'p95_ms': _number(row.get('95%')),
+                'p99_ms': _number(row.get('99%')),
+                'breaches': [],
+            }
+            if not count:
+                result['breaches'].append('no requests completed')
+            elif failures / count > self.options['max_error_rate']:
+                result['breaches'].append(f"error rate {failures / count:.2%} > {self.options['max_error_rate']:.2%}")
+            for slo_key, budget in (self.slos.get((name, method)) or self.default_slo).items():
+                observed = _number(row.get(_column(slo_key)))
+                if observed is not None and observed > budget:
+                    result['breaches'].append(f'{slo_key} {observed:g}ms > {budget:g}ms')
+            passed = passed and not result['breaches']
+            results[f'{method} {name}'] = result
+
+        total = _number((rows.get(None) or {}).get('Requests/s')) or 0
+        if total < rate * (1 - self.options['tolerance']):
+            results.setdefault('(all)', {'breaches': []})['breaches'].append(
+                f'throughput {total:.1f}/s < target {rate:g}/s')
+            passed = False
+        return passed, results
+
+    def search(self, label, task=None):
+        """Search the arrival rate for one task (or the whole mix) and return its saturation point."""
+        options = self.options
+        levels = []
+
+        def probe(rate):
+            rate = round(rate, 2)
+            passed, results = self.evaluate(self.run_level(label, task, rate), rate)
+            levels.append({'target_rps': rate, 'passed': passed, 'operations': results})
+            print(f"   {label} @ {rate:g}/s: {'ok' if passed else 'saturated'}"
+                  + ''.join(f'\n      {op}: {"; ".join(r["breaches"])}' for op, r in results.items() if r['breaches']))
+            return passed
+
+        last_ok, first_bad = None, None
+        rate = options['start']
+        while True:
+            if not probe(rate):
+                first_bad = rate
+                break
+            last_ok = rate
+            if rate >= options['max_rps']:
+                break
+            rate = min(rate + options['step'] if options['mode'] == 'step' else rate * 2, options['max_rps'])
+
+        if options['mode'] == 'binary' and first_bad is not None:
+            lo, hi = last_ok or 0.0, first_bad
+            while hi - lo > max(options['precision'] * hi, 1.0):
+                mid = (lo + hi) / 2
+                if probe(mid):
+                    lo = mid
+                else:
+                    hi = mid
+            last_ok, first_bad = lo or None, hi
+
+        best = max((level for level in levels if level['passed']), key=lambda level: level['target_rps'], default=None)
+        return {
+            'saturation_rps': round(last_ok, 2) if last_ok else None,
+            'first_failing_rps': round(first_bad, 2) if first_bad else None,
+            'reached_max': first_bad is None,
+            'at_saturation': best['operations'] if best else None,
+            'levels': levels,
+        }
+
+    def run(self):
+        if self.options['mixed']:
+            return {'scenario': self.search('mixed')}
+        tasks = self.options['operations'] or self.tasks
+        unknown = sorted(set(tasks) - set(self.tasks))
+        if unknown:
+            raise ValueError(f"Unknown task(s) {', '.join(unknown)}; the locustfile defines {', '.join(self.tasks)}")
+        return {task: self.search(task, task) for task in tasks}
+
+
+def render_summary(results):
+    lines = ['| Operation | Saturation rps | First failing rps | p95 ms at saturation | Limited by |',
+             '|-----------|---------------:|------------------:|---------------------:|------------|']
+    for label, result in results.items():
+        at = {op: r for op, r in (result['at_saturation'] or {}).items() if op != '(all)'}
+        p95 = max((r['p95_ms'] for r in at.values() if r.get('p95_ms') is not None), default=None)
+        failing = next((level for level in result['levels'] if level['target_rps'] == result['first_failing_rps']), None)
+        limited_by = '; '.join(
+            breach for r in (failing['operations'].values() if failing else []) for breach in r['breaches']
+        ) or ('max rate reached' if result['reached_max'] else '-')
+        requests = sorted({op for level in result['levels'] for op in level['operations'] if op != '(all)'})
+        lines.append('| {} | {} | {} | {} | {} |'.format(
+            ', '.join(requests) if label != 'mixed' and requests else label,
+            '-' if result['saturation_rps'] is None else f"{result['saturation_rps']:g}",
+            '-' if result['first_failing_rps'] is None else f"{result['first_failing_rps']:g}",
+            '-' if p95 is None else f'{p95:g}',
+            limited_by))
+    return '\n'.join(lines)
+
+
+def main(locustfile, **options):
+    options = {**DEFAULTS, **options}
+    search = CapacitySearch(locustfile, options)
+    print(f"📈 Capacity search ({options['mode']}) for {locustfile} against {options['host']}")
+    try:
+        results = search.run()
+    except Exception:
+        print(f"❌ Capacity search failed; Locust logs kept in {search.csv_dir}")
+        raise
+    except BaseException:
+        search.close()
+        raise
+    search.close()
+
+    print()
+    print(render_summary(results))
+    if options['out']:
+        with open(options['out'], 'w') as f:
+            json.dump({'locustfile': locustfile, 'options': options, 'results': results}, f, indent=2)
+        print(f"\nCapacity report written to {options['out']}")
+    return results
+
+if __name__ == "__main__":
+    options = {}
+    positional = []
+    it = iter(sys.argv[1:])
+    numeric = {'--start': 'start', '--step': 'step', '--max-rps': 'max_rps', '--precision': 'precision',
+               '--max-error-rate': 'max_error_rate', '--tolerance': 'tolerance'}
+    integer = {'--step-time': 'step_time', '--max-users': 'max_users', '--processes': 'processes'}
+    for arg in it:
+        if arg in numeric:
+            options[numeric[arg]] = float(next(it, 0))
+        elif arg in integer:
+            options[integer[arg]] = int(next(it, 0))
+        elif arg in ('--host', '--mode', '--slo', '--out'):
+            options[arg[2:]] = next(it, None)
+        elif arg == '--csv-dir':
+            options['csv_dir'] = next(it, None)
+        elif arg == '--operation':
+            options.setdefault('operations', []).append(next(it, None))
+        elif arg == '--mixed':
+            options['mixed'] = True
+        else:
+            positional.append(arg)
+    if len(positional) != 1 or options.get('mode', 'binary') not in ('binary', 'step'):
+        print("Usage: python capacity_search.py <locustfile.py> [--host <url>] [--mode binary|step] [--start <rps>] "
+              "[--step <rps>] [--max-rps <rps>] [--step-time <seconds>] [--precision <fraction>] "
+              "[--max-error-rate <fraction>] [--tolerance <fraction>] [--slo p95=200ms] [--max-users <n>] "
+              "[--processes <n>] [--operation <task> ...] [--mixed] [--csv-dir <dir>] [--out <capacity.json>]")
+        sys.exit(1)
+    main(positional[0], **options)
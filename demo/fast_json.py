@@ -0,0 +1,24 @@
+"""Compact JSON encoding to bytes, using orjson when it is installed.
+
+orjson is optional (``pip install orjson``); without it the stdlib encoder
+is used with compact separators, so the output is equivalent either way.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    def dumps(value):
+        return orjson.dumps(value)
+else:
+    def dumps(value):
+        return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+def join_array(items):
+    """Assemble already-encoded JSON values into a JSON array without re-encoding them."""
+    return b'[' + b','.join(items) + b']'
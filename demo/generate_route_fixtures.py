@@ -0,0 +1,177 @@
+import sys
+import json
+import re
+
+from spec_mock import SpecRouter, is_templated, load_spec, path_pattern
+
+FIXTURE_TEMPLATE = '''import {{ test as base, expect, BrowserContext }} from '@playwright/test';
+
+// Generated network-interception fixtures
+// Sources: {sources}
+//
+// Every page in the test's browser context is served from the responses
+// below instead of the network. Import `test` and `expect` from this file
+// in place of '@playwright/test' to enable it.
+
+type MockResponse = {{ status: number; headers: Record<string, string>; body: string; base64?: boolean }};
+
+// "METHOD url" -> response; urls with a query string are matched first, then without it
+const exactRoutes: Record<string, MockResponse> = {{
+{exact_routes}
+}};
+
+// [method, url pattern, response] for templated spec paths such as /users/{{userId}}
+const patternRoutes: [string, RegExp, MockResponse][] = [
+{pattern_routes}
+];
+
+// When true, requests that match no route are aborted instead of going to the network
+const BLOCK_UNMATCHED = {block_unmatched};
+
+function findResponse(method: string, url: string): MockResponse | undefined {{
+  const withoutHash = url.split('#')[0];
+  const withoutQuery = withoutHash.split('?')[0];
+  const exact = exactRoutes[`${{method}} ${{withoutHash}}`] ?? exactRoutes[`${{method}} ${{withoutQuery}}`];
+  if (exact) return exact;
+  const match = patternRoutes.find(([routeMethod, pattern]) => routeMethod === method && pattern.test(withoutQuery));
+  return match?.[2];
+}}
+
+export async function installMockRoutes(context: BrowserContext) {{
+  await context.route('**/*', async route => {{
+    const request = route.request();
+    const response = findResponse(request.method(), request.url());
+    if (response) {{
+      await route.fulfill({{
+        status: response.status,
+        headers: response.headers,
+        body: response.base64 ? Buffer.from(response.body, 'base64') : response.body,
+      }});
+    }} else if (BLOCK_UNMATCHED) {{
+      await route.abort('blockedbyclient');
+    }} else {{
+      await route.fallback();
+    }}
+  }});
+}}
+
+export const test = base.extend<{{ mockRoutes: void }}>({{
+  mockRoutes: [async ({{ context }}, use) => {{
+    await installMockRoutes(context);
+    await use();
+  }}, {{ auto: true }}],
+}});
+
+export {{ expect }};
+'''
+
+# Headers that describe the original transfer rather than the decoded body we replay
+SKIPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'}
+
+
+def _mock_response(status, headers, body, base64=False):
+    response = {"status": status, "headers": headers, "body": body}
+    if base64:
+        response["base64"] = True
+    return response
+
+
+def spec_routes(spec, base_url):
+    """Yield ``(method, url, templated, response)`` for every operation in the spec."""
+    router = SpecRouter(spec)
+    for path, methods in list(router.static.values()) + router.routes:
+        for method, (status, headers, body) in methods.items():
+            if method == 'HEAD':
+                continue
+            headers = {name.lower(): value for name, value in headers if name.lower() not in SKIPPED_HEADERS}
+            response = _mock_response(int(status.split()[0]), headers, body.decode('utf-8'))
+            yield method, base_url + path, is_templated(path), response
+
+
+def har_routes(har):
+    """Yield ``(method, url, False, response)`` for every entry of a HAR recording."""
+    for entry in har.get('log', {}).get('entries', []):
+        request = entry.get('request', {})
+        response = entry.get('response', {})
+        content = response.get('content', {})
+        headers = {
+            header['name'].lower(): header['value']
+            for header in response.get('headers', [])
+            if header['name'].lower() not in SKIPPED_HEADERS and not header['name'].startswith(':')
+        }
+        if 'mimeType' in content and 'content-type' not in headers:
+            headers['content-type'] = content['mimeType']
+        yield request.get('method', 'GET'), request.get('url', ''), False, _mock_response(
+            response.get('status', 200),
+            headers,
+            content.get('text', ''),
+            content.get('encoding') == 'base64',
+        )
+
+
+def spec_base_url(spec):
+    servers = spec.get('servers') or []
+    if servers and re.match(r'^https?://', servers[0].get('url', '')):
+        return re.match(r'^https?://[^/]+', servers[0]['url']).group(0)
+    if 'host' in spec:
+        scheme = (spec.get('schemes') or ['http'])[0]
+        return f"{scheme}://{spec['host']}"
+    return 'http://localhost:5000'
+
+
+def generate_fixtures(routes, sources, block_unmatched=False):
+    exact = {}
+    patterns = []
+    # Later sources win, so recorded HAR responses override spec-generated ones
+    for method, url, templated, response in routes:
+        if templated:
+            patterns.append(f'  [{json.dumps(method)}, new RegExp({json.dumps("^" + path_pattern(url) + "$")}), {json.dumps(response)}]')
+        else:
+            exact[f'{method} {url}'] = response
+
+    exact_routes = ',\n'.join(f'  {json.dumps(key)}: {json.dumps(response)}' for key, response in exact.items())
+    return FIXTURE_TEMPLATE.format(
+        sources=', '.join(sources),
+        exact_routes=exact_routes,
+        pattern_routes=',\n'.join(patterns),
+        block_unmatched='true' if block_unmatched else 'false'
+    )
+
+
+def main(output_path, spec_path=None, har_path=None, base_url=None, block_unmatched=False):
+    routes = []
+    sources = []
+    if spec_path:
+        spec = load_spec(spec_path)
+        routes.extend(spec_routes(spec, base_url or spec_base_url(spec)))
+        sources.append(spec_path)
+    if har_path:
+        with open(har_path, 'r', encoding='utf-8') as f:
+            routes.extend(har_routes(json.load(f)))
+        sources.append(har_path)
+
+    with open(output_path, 'w') as f:
+        f.write(generate_fixtures(routes, sources, block_unmatched))
+
+    print(f"Route fixtures for {len(routes)} responses generated at {output_path}")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = {'spec_path': None, 'har_path': None, 'base_url': None, 'block_unmatched': False}
+    positional = []
+    it = iter(args)
+    for arg in it:
+        if arg == '--spec':
+            options['spec_path'] = next(it, None)
+        elif arg == '--har':
+            options['har_path'] = next(it, None)
+        elif arg == '--base-url':
+            options['base_url'] = next(it, None)
+        elif arg == '--block-unmatched':
+            options['block_unmatched'] = True
+        else:
+            positional.append(arg)
+    if len(positional) != 1 or not (options['spec_path'] or options['har_path']):
+        print("Usage: python generate_route_fixtures.py <output.ts> [--spec <swagger.yaml>] [--har <recording.har>] [--base-url <url>] [--block-unmatched]")
+        sys.exit(1)
+    main(positional[0], **options)
@@ -1,12 +1,21 @@
-from flask import Flask, jsonify, request, render_template_string
+import atexit
+import codecs
+import json
+import signal
+import sys
+
+from flask import Flask, Response, abort, g, jsonify, make_response, request, render_template_string
+
+from fast_json import dumps, join_array
+from profiling import parse_profile_args
+from user_store import TenantRegistry, UserStore
 
 app = Flask(__name__)
 
-# Sample data
-users = [
-    {"id": 1, "name": "John Doe", "email": "john@example.com"},
-    {"id": 2, "name": "Jane Smith", "email": "jane@example.com"}
-]
+# Sample data; replaced by a persistent store when started with --data-dir
+store = UserStore()
+# Isolated copy-on-write views of the store, selected per request (see current_store)
+tenants = TenantRegistry(store)
 
 # HTML Templates for Web UI Testing
 DOCS_TEMPLATE = """
@@ -250,33 +259,200 @@ LOCATION_TEST_TEMPLATE = """
 </html>
 """
 
+# Read paths serve JSON the store has already encoded instead of going through jsonify
+HELLO_BODY = dumps({"message": "Hello, World!"})
+
+def json_response(body, status=200):
+    return Response(body, status=status, mimetype='application/json')
+
+# Tenants
+TENANT_HEADER = 'X-Tenant'
+TENANT_PREFIX = '/t/'
+
+class TenantPrefixMiddleware:
+    """Route ``/t/<tenant>/...`` to ``/...`` with the tenant passed on as the X-Tenant header."""
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if path.startswith(TENANT_PREFIX):
+            tenant, _, rest = path[len(TENANT_PREFIX):].partition('/')
+            environ['HTTP_X_TENANT'] = tenant
+            environ['SCRIPT_NAME'] = environ.get('SCRIPT_NAME', '') + TENANT_PREFIX + tenant
+            environ['PATH_INFO'] = '/' + rest
+        return self.wsgi_app(environ, start_response)
+
+app.wsgi_app = TenantPrefixMiddleware(app.wsgi_app)
+
+def current_store():
+    """The store for the request's tenant; requests without one share the seed store."""
+    if 'store' not in g:
+        try:
+            g.store = tenants.get(request.headers.get(TENANT_HEADER))
+        except ValueError as e:
+            abort(make_response(jsonify({"error": str(e)}), 400))
+    return g.store
+
+@app.route('/tenants/<tenant>/reset', methods=['POST'])
+def reset_tenant(tenant):
+    tenants.reset(tenant)
+    return '', 204
+
+@app.route('/tenants:reset', methods=['POST'])
+def reset_tenants():
+    tenants.reset()
+    return '', 204
+
 # API Routes
 @app.route('/hello', methods=['GET'])
 def hello():
-    return jsonify({"message": "Hello, World!"})
+    return json_response(HELLO_BODY)
 
 @app.route('/users', methods=['GET'])
 def get_users():
-    return jsonify(users)
+    try:
+        offset = int(request.args.get('offset', 0))
+        limit = int(request.args['limit']) if 'limit' in request.args else None
+    except ValueError:
+        return jsonify({"error": "offset and limit must be integers"}), 400
+    if offset < 0 or (limit is not None and limit < 0):
+        return jsonify({"error": "offset and limit must not be negative"}), 400
+    return json_response(current_store().page_raw(offset, limit))
 
 @app.route('/users', methods=['POST'])
 def create_user():
     data = request.get_json()
-    new_user = {
-        "id": len(users) + 1,
-        "name": data.get("name"),
-        "email": data.get("email")
-    }
-    users.append(new_user)
-    return jsonify(new_user), 201
+    new_user = current_store().create_raw(data.get("name"), data.get("email"))
+    return json_response(new_user, 201)
 
 @app.route('/users/<int:user_id>', methods=['GET'])
 def get_user(user_id):
-    user = next((u for u in users if u["id"] == user_id), None)
+    user = current_store().get_raw(user_id)
     if user:
-        return jsonify(user)
+        return json_response(user)
     return jsonify({"error": "User not found"}), 404
 
+# Batch API Routes
+def iter_ndjson(stream, chunk_size=64 * 1024):
+    """Yield ``(item, error)`` for each non-empty line of an NDJSON stream."""
+    def lines():
+        # Chunked reads are much faster than readline() on the request stream
+        pending = b''
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            chunk_lines = (pending + chunk).split(b'\n')
+            pending = chunk_lines.pop()
+            yield from chunk_lines
+        yield pending
+
+    for line in lines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line), None
+        except ValueError as e:
+            yield None, f"Invalid JSON: {e}"
+
+def iter_json_array(stream, chunk_size=64 * 1024):
+    """Yield ``(item, None)`` for each element of a JSON array as it is read from ``stream``."""
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer, pos, eof = '', 0, False
+    state = 'start'
+
+    while True:
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+        if pos == len(buffer) or state == 'read':
+            if eof:
+                raise ValueError("Unexpected end of JSON array")
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + text_decoder.decode(chunk, final=eof)
+            pos = 0
+            state = 'value' if state == 'read' else state
+            continue
+
+        char = buffer[pos]
+        if state == 'start':
+            if char != '[':
+                raise ValueError("Expected a JSON array")
+            pos += 1
+            state = 'first'
+        elif char == ']' and state in ('first', 'separator'):
+            return
+        elif state == 'separator':
+            if char != ',':
+                raise ValueError("Expected ',' or ']' in JSON array")
+            pos += 1
+            state = 'value'
+        else:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                if eof:
+                    raise
+                state = 'read'
+                continue
+            # A value that ends exactly at the buffer edge may be a truncated number.
+            if end == len(buffer) and not eof:
+                state = 'read'
+                continue
+            pos = end
+            state = 'separator'
+            yield item, None
+
+@app.route('/users:batch', methods=['POST'])
+def create_users_batch():
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        items = iter_ndjson(request.stream)
+    else:
+        items = iter_json_array(request.stream)
+
+    results = []
+    records = []
+    slots = []
+    try:
+        for item, error in items:
+            if error is None and not isinstance(item, dict):
+                error = "Expected a JSON object"
+            if error is not None:
+                results.append(dumps({"status": 400, "error": error}))
+                continue
+            slots.append(len(results))
+            results.append(None)
+            records.append((item.get("name"), item.get("email")))
+    except ValueError as e:
+        return jsonify({"error": f"Invalid JSON array: {e}"}), 400
+
+    # Created users are spliced in as the bytes the store already encoded
+    for slot, user in zip(slots, current_store().create_many_raw(records)):
+        results[slot] = b'{"status":201,"user":%s}' % user
+
+    status = 201 if len(records) == len(results) else 207
+    body = b'{"created":%d,"failed":%d,"results":' % (len(records), len(results) - len(records))
+    return json_response(body + join_array(results) + b'}', status)
+
+@app.route('/users:batch', methods=['GET'])
+def get_users_batch():
+    try:
+        user_ids = [int(user_id) for user_id in request.args.get('ids', '').split(',') if user_id.strip()]
+    except ValueError:
+        return jsonify({"error": "ids must be a comma-separated list of integers"}), 400
+
+    results = []
+    for user_id, user in zip(user_ids, current_store().get_raw_many(user_ids)):
+        if user:
+            results.append(b'{"id":%d,"status":200,"user":%s}' % (user_id, user))
+        else:
+            results.append(b'{"id":%d,"status":404,"error":"User not found"}' % user_id)
+    return json_response(b'{"results":' + join_array(results) + b'}')
+
 # Web UI Routes for Testing
 @app.route('/docs')
 def docs():
@@ -294,11 +470,71 @@ def explorer():
 def location_test():
     return render_template_string(LOCATION_TEST_TEMPLATE)
 
+# Profiling
+def enable_profiling(profiler):
+    """Time every request as a profiler stage named after its route."""
+    @app.before_request
+    def start_profile_stage():
+        rule = request.url_rule.rule if request.url_rule else request.path
+        g.profile_stage = profiler.stage(f"{request.method} {rule}")
+        g.profile_stage.__enter__()
+
+    @app.teardown_request
+    def end_profile_stage(exc):
+        stage = g.pop('profile_stage', None)
+        if stage is not None:
+            stage.__exit__(None, None, None)
+
+def parse_server_args(args):
+    options = {'data_dir': None, 'spec': None}
+    it = iter(args)
+    for arg in it:
+        if arg == '--data-dir':
+            options['data_dir'] = next(it, None)
+        elif arg == '--spec':
+            options['spec'] = next(it, None)
+        else:
+            print("Usage: python mock-api-server.py [--data-dir <dir> | --spec <openapi.yaml>] [--profile <profile.json>]")
+            sys.exit(1)
+    return options
+
+def run_spec_mock(spec_path, profiler):
+    """Serve every operation in ``spec_path`` from precomputed responses instead of the Flask routes."""
+    from werkzeug.serving import run_simple
+    from spec_mock import SpecMockApp, load_spec
+
+    spec_app = SpecMockApp(load_spec(spec_path), profiler)
+    print(f"🧩 Spec-driven mock for {spec_path}")
+    for route in spec_app.describe():
+        print(f"   {route}")
+    run_simple('localhost', 5000, spec_app, threaded=True)
+
 if __name__ == '__main__':
+    # cProfile would only see the main thread, not the request threads; sampling covers them all
+    profiler, args = parse_profile_args(sys.argv[1:], profilers=('none', 'sample'))
+    options = parse_server_args(args)
+    # Turn SIGTERM into a normal exit so atexit hooks flush the profile and data files
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    if options['spec']:
+        run_spec_mock(options['spec'], profiler)
+        sys.exit(0)
+    if options['data_dir']:
+        store = UserStore(options['data_dir'])
+        tenants = TenantRegistry(store)
+        atexit.register(store.close)
+        print(f"💾 Loaded {len(store):,} users from {options['data_dir']}")
+    if profiler.enabled:
+        enable_profiling(profiler)
+        print(f"⏱️ Profiling requests, report will be written to {profiler.output_path} on exit")
+
     print("🚀 Starting Mock API Server with Web UI Support...")
     print("📚 API Documentation: http://localhost:5000/docs")
     print("🧪 Interactive Tester: http://localhost:5000/test")
     print("🔍 API Explorer: http://localhost:5000/explorer")
     print("📍 Location Testing: http://localhost:5000/location-test")
-    print("🔌 API Endpoints: /hello, /users")
-    app.run(debug=True, host='localhost', port=5000)
+    print("🔌 API Endpoints: /hello, /users, /users:batch")
+    print(f"🏢 Tenants: send {TENANT_HEADER}: <name> or prefix paths with {TENANT_PREFIX}<name>, reset with POST /tenants/<name>/reset")
+    # The reloader runs this module in a second process, which would split the
+    # profile in two and hold the data files open alongside the real server
+    use_reloader = not (profiler.enabled or options['data_dir'])
+    app.run(debug=True, host='localhost', port=5000, use_reloader=use_reloader)
@@ -1,6 +1,8 @@
 import sys
 import json
 
+from profiling import NULL_PROFILER, parse_profile_args
+
 MCP_LOAD_TEST_TEMPLATE = '''# Azure MCP Load Testing Commands
 # Generated from Postman: {postman_file}
 
@@ -91,26 +93,37 @@ def generate_load_test_commands(collection, test_resource_name):
     
     return '\\n'.join(commands) if commands else '# No API requests found for load testing'
 
-def main(postman_path, output_path):
+def load_collection(postman_path):
     with open(postman_path, 'r') as f:
-        collection = json.load(f)
-    
+        return json.load(f)
+
+def render(collection, postman_path, profiler=NULL_PROFILER):
     test_resource_name = "postman-demo-loadtest"
-    load_test_commands = generate_load_test_commands(collection, test_resource_name)
+    with profiler.stage('generate'):
+        load_test_commands = generate_load_test_commands(collection, test_resource_name)
+    
+    with profiler.stage('render'):
+        return MCP_LOAD_TEST_TEMPLATE.format(
+            postman_file=postman_path,
+            test_resource_name=test_resource_name,
+            load_test_commands=load_test_commands
+        )
+
+def main(postman_path, output_path, profiler=NULL_PROFILER):
+    with profiler.stage('load'):
+        collection = load_collection(postman_path)
     
-    mcp_script = MCP_LOAD_TEST_TEMPLATE.format(
-        postman_file=postman_path,
-        test_resource_name=test_resource_name,
-        load_test_commands=load_test_commands
-    )
+    mcp_script = render(collection, postman_path, profiler)
     
-    with open(output_path, 'w') as f:
-        f.write(mcp_script)
+    with profiler.stage('write'):
+        with open(output_path, 'w') as f:
+            f.write(mcp_script)
     
     print(f"Azure MCP Load Testing script generated at {output_path}")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python postman_to_azure_mcp.py <postman.json> <output.sh>")
+    profiler, args = parse_profile_args(sys.argv[1:])
+    if len(args) != 2:
+        print("Usage: python postman_to_azure_mcp.py <postman.json> <output.sh> [--profile <profile.json>]")
         sys.exit(1)
-    main(sys.argv[1], sys.argv[2])
+    main(args[0], args[1], profiler)
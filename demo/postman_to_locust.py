@@ -1,6 +1,10 @@
+import re
 import sys
 import json
 
+from profiling import NULL_PROFILER, parse_profile_args
+from slo import LOCUST_SLO_CHECK, postman_slo, render_slo_table
+
 TEMPLATE = '''from locust import HttpUser, task
 
 class PostmanUser(HttpUser):
@@ -9,16 +13,106 @@ class PostmanUser(HttpUser):
         self.client.get("/hello")
 '''
 
-def main(postman_path, output_path):
+# One task per request in the collection, named after the request URL
+OPERATIONS_TEMPLATE = '''from locust import HttpUser, events, task
+
+# Latency budgets in ms declared with x-slo, keyed by (request name, HTTP method)
+SLOS = {{
+{slos}}}
+
+class PostmanUser(HttpUser):
+{tasks}
+'''
+
+TASK_TEMPLATE = '''    @task
+    def {task_name}(self):
+        self.client.request({method!r}, {url!r}, name={name!r}{extra})
+'''
+
+def _task_name(name, used):
+    base = re.sub(r'\W+', '_', name).strip('_').lower() or 'request'
+    if base[0].isdigit():
+        base = f'request_{base}'
+    task_name, n = base, 2
+    while task_name in used:
+        task_name, n = f'{base}_{n}', n + 1
+    used.add(task_name)
+    return task_name
+
+def _relative_url(url):
+    if isinstance(url, dict):
+        url = url.get('raw', '')
+    # Simple URL parsing - remove protocol and host for relative paths
+    if url.startswith('http'):
+        url_parts = url.split('/', 3)
+        url = '/' + url_parts[3] if len(url_parts) > 3 else '/'
+    return url
+
+def _request_body(request):
+    body = request.get('body') or {}
+    if body.get('mode') != 'raw' or not body.get('raw'):
+        return ''
+    try:
+        return f", json={json.loads(body['raw'])!r}"
+    except ValueError:
+        return f", data={body['raw']!r}"
+
+def generate_operations(collection):
+    """Return ``(item name, method, url, extra request kwargs, slo)`` for every request."""
+    operations = []
+    for item in collection.get('item', []):
+        if 'request' not in item:
+            continue
+        request = item['request']
+        url = _relative_url(request.get('url', ''))
+        headers = {
+            header['key']: header['value']
+            for header in request.get('header', [])
+            if not header.get('disabled') and header['key'].lower() != 'content-type'
+        }
+        extra = _request_body(request) + (f', headers={headers!r}' if headers else '')
+        operations.append((item.get('name', 'Unnamed request'), request.get('method', 'GET').upper(),
+                           url, extra, postman_slo(request)))
+    return operations
+
+def load_collection(postman_path):
     with open(postman_path, 'r') as f:
-        collection = json.load(f)
-    # For demo, just output a static Locust script for /hello
-    with open(output_path, 'w') as f:
-        f.write(TEMPLATE)
+        return json.load(f)
+
+def render(collection, postman_path, profiler=NULL_PROFILER):
+    with profiler.stage('generate'):
+        operations = generate_operations(collection)
+    if not operations:
+        return TEMPLATE
+    with profiler.stage('render'):
+        used = set()
+        tasks = '\n'.join(
+            TASK_TEMPLATE.format(
+                task_name=_task_name(name, used),
+                method=method,
+                url=url,
+                name=url.split('?')[0],
+                extra=extra
+            )
+            for name, method, url, extra, _ in operations
+        )
+        slos = {}
+        for _, method, url, _, slo in operations:
+            slos.setdefault((url.split('?')[0], method), slo)
+        return OPERATIONS_TEMPLATE.format(slos=render_slo_table(slos), tasks=tasks.rstrip('\n')) + LOCUST_SLO_CHECK
+
+def main(postman_path, output_path, profiler=NULL_PROFILER):
+    with profiler.stage('load'):
+        collection = load_collection(postman_path)
+    locust_code = render(collection, postman_path, profiler)
+    with profiler.stage('write'):
+        with open(output_path, 'w') as f:
+            f.write(locust_code)
     print(f"Locust script generated at {output_path}")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python postman_to_locust.py <postman.json> <output.py>")
+    profiler, args = parse_profile_args(sys.argv[1:])
+    if len(args) != 2:
+        print("Usage: python postman_to_locust.py <postman.json> <output.py> [--profile <profile.json>]")
         sys.exit(1)
-    main(sys.argv[1], sys.argv[2])
+    main(args[0], args[1], profiler)
@@ -1,7 +1,11 @@
 import sys
 import json
 
-PLAYWRIGHT_TEMPLATE = '''import {{ test, expect }} from '@playwright/test';
+from profiling import NULL_PROFILER, parse_profile_args
+from slo import postman_slo, sample_budget
+from tenant_fixture import TENANT_TEST_IMPORTS
+
+PLAYWRIGHT_TEMPLATE = '''{test_imports}
 
 // Generated from Postman Collection: {collection_file}
 test.describe('API Tests from Postman', () => {{
@@ -18,8 +22,53 @@ TEST_METHOD_TEMPLATE = '''
     console.log('Response:', responseData);
   }});'''
 
-def generate_test_methods(collection):
-    test_methods = []
+# Used for requests whose description declares an x-slo latency budget
+TEST_METHOD_SLO_TEMPLATE = '''
+  test('{test_name}', async ({{ request }}) => {{
+    const started = performance.now();
+    const response = await request.{http_method}('{url}'{headers});
+    const elapsed = performance.now() - started;
+    test.info().annotations.push({{ type: 'latency-ms', description: elapsed.toFixed(1) }});
+    expect(response.status()).toBe(200);
+    expect.soft(elapsed, 'latency budget {budget}ms').toBeLessThanOrEqual({budget});
+
+    const responseData = await response.json();
+    console.log('Response:', responseData);
+  }});'''
+
+# Compact output: one parameterized test loop over a case table, so the
+# generated file grows with the number of requests rather than with code.
+COMPACT_PLAYWRIGHT_TEMPLATE = '''{test_imports}
+
+// Generated from Postman Collection: {collection_file}
+// [test name, HTTP method, url, x-slo latency budget in ms]
+const cases: [string, string, string, number | null][] = [
+{test_cases}
+];
+
+test.describe('API Tests from Postman', () => {{
+  if (cases.length === 0) test.skip('No API requests found', () => {{}});
+
+  for (const [name, method, url, budgetMs] of cases) {{
+    test(name, async ({{ request }}) => {{
+      const started = performance.now();
+      const response = await request.fetch(url, {{ method }});
+      const elapsed = performance.now() - started;
+      expect(response.status()).toBe(200);
+      if (budgetMs !== null) {{
+        test.info().annotations.push({{ type: 'latency-ms', description: elapsed.toFixed(1) }});
+        expect.soft(elapsed, `latency budget ${{budgetMs}}ms`).toBeLessThanOrEqual(budgetMs);
+      }}
+
+      const responseData = await response.json();
+      console.log('Response:', responseData);
+    }});
+  }}
+}});
+'''
+
+def generate_test_cases(collection):
+    test_cases = []
     
     if 'item' in collection:
         for item in collection['item']:
@@ -41,38 +90,79 @@ def generate_test_methods(collection):
                     else:
                         url = '/'
                 
-                # Handle headers (simplified)
-                headers = ''
-                if 'header' in request and request['header']:
-                    headers = ', { headers: { /* Add headers here */ } }'
-                
-                test_method = TEST_METHOD_TEMPLATE.format(
-                    test_name=test_name,
-                    http_method=method,
-                    url=url,
-                    headers=headers
-                )
-                test_methods.append(test_method)
+                has_headers = bool(request.get('header'))
+                budget = sample_budget(postman_slo(request))
+                test_cases.append((test_name, method, url, has_headers, budget))
+    
+    return test_cases
+
+def generate_test_methods(collection):
+    test_methods = []
+    
+    for test_name, method, url, has_headers, budget in generate_test_cases(collection):
+        # Handle headers (simplified)
+        headers = ''
+        if has_headers:
+            headers = ', { headers: { /* Add headers here */ } }'
+        
+        template = TEST_METHOD_TEMPLATE if budget is None else TEST_METHOD_SLO_TEMPLATE
+        test_method = template.format(
+            test_name=test_name,
+            http_method=method,
+            url=url,
+            headers=headers,
+            budget=f'{budget:g}' if budget is not None else None
+        )
+        test_methods.append(test_method)
     
     return '\\n'.join(test_methods) if test_methods else '\\n  test.skip("No API requests found", () => {});'
 
-def main(postman_path, output_path):
+def load_collection(postman_path):
     with open(postman_path, 'r') as f:
-        collection = json.load(f)
+        return json.load(f)
+
+def render_compact(collection, postman_path, profiler=NULL_PROFILER):
+    with profiler.stage('generate'):
+        test_cases = ',\n'.join(
+            f'  {json.dumps([test_name, method, url, budget])}'
+            for test_name, method, url, _, budget in generate_test_cases(collection)
+        )
+    with profiler.stage('render'):
+        return COMPACT_PLAYWRIGHT_TEMPLATE.format(
+            test_imports=TENANT_TEST_IMPORTS,
+            collection_file=postman_path,
+            test_cases=test_cases
+        )
+
+def render(collection, postman_path, profiler=NULL_PROFILER, compact=False):
+    if compact:
+        return render_compact(collection, postman_path, profiler)
+    with profiler.stage('generate'):
+        test_methods = generate_test_methods(collection)
+    with profiler.stage('render'):
+        return PLAYWRIGHT_TEMPLATE.format(
+            test_imports=TENANT_TEST_IMPORTS,
+            collection_file=postman_path,
+            test_methods=test_methods
+        )
+
+def main(postman_path, output_path, profiler=NULL_PROFILER, compact=False):
+    with profiler.stage('load'):
+        collection = load_collection(postman_path)
     
-    test_methods = generate_test_methods(collection)
-    playwright_code = PLAYWRIGHT_TEMPLATE.format(
-        collection_file=postman_path,
-        test_methods=test_methods
-    )
+    playwright_code = render(collection, postman_path, profiler, compact)
     
-    with open(output_path, 'w') as f:
-        f.write(playwright_code)
+    with profiler.stage('write'):
+        with open(output_path, 'w') as f:
+            f.write(playwright_code)
     
     print(f"Playwright test generated at {output_path}")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python postman_to_playwright.py <postman.json> <output.spec.ts>")
+    profiler, args = parse_profile_args(sys.argv[1:])
+    compact = '--compact' in args
+    args = [arg for arg in args if arg != '--compact']
+    if len(args) != 2:
+        print("Usage: python postman_to_playwright.py <postman.json> <output.spec.ts> [--compact] [--profile <profile.json>]")
         sys.exit(1)
-    main(sys.argv[1], sys.argv[2])
+    main(args[0], args[1], profiler, compact)
@@ -1,6 +1,8 @@
 import sys
 import json
 
+from profiling import NULL_PROFILER, parse_profile_args
+
 MCP_PLAYWRIGHT_TEMPLATE = '''/**
  * MCP Playwright Test Commands
  * Generated from Postman: {postman_file}
@@ -109,23 +111,34 @@ def generate_mcp_commands(collection):
     
     return ',\\n'.join(commands) if commands else '// No API requests found'
 
-def main(postman_path, output_path):
+def load_collection(postman_path):
     with open(postman_path, 'r') as f:
-        collection = json.load(f)
+        return json.load(f)
+
+def render(collection, postman_path, profiler=NULL_PROFILER):
+    with profiler.stage('generate'):
+        test_commands = generate_mcp_commands(collection)
+    with profiler.stage('render'):
+        return MCP_PLAYWRIGHT_TEMPLATE.format(
+            postman_file=postman_path,
+            test_commands=test_commands
+        )
+
+def main(postman_path, output_path, profiler=NULL_PROFILER):
+    with profiler.stage('load'):
+        collection = load_collection(postman_path)
     
-    test_commands = generate_mcp_commands(collection)
-    mcp_script = MCP_PLAYWRIGHT_TEMPLATE.format(
-        postman_file=postman_path,
-        test_commands=test_commands
-    )
+    mcp_script = render(collection, postman_path, profiler)
     
-    with open(output_path, 'w') as f:
-        f.write(mcp_script)
+    with profiler.stage('write'):
+        with open(output_path, 'w') as f:
+            f.write(mcp_script)
     
     print(f"MCP Playwright commands generated at {output_path}")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python postman_to_playwright_mcp.py <postman.json> <output.js>")
+    profiler, args = parse_profile_args(sys.argv[1:])
+    if len(args) != 2:
+        print("Usage: python postman_to_playwright_mcp.py <postman.json> <output.js> [--profile <profile.json>]")
         sys.exit(1)
-    main(sys.argv[1], sys.argv[2])
+    main(args[0], args[1], profiler)
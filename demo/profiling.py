@@ -0,0 +1,266 @@
+"""Per-stage timing hooks shared by the converters and the mock server.
+
+Every converter ``main()`` takes an optional ``profiler``. By default it is
+``NULL_PROFILER``, whose ``stage()`` hands back one shared no-op context
+manager, so an unprofiled run pays a single attribute lookup per stage.
+
+Command line usage (any converter, or mock-api-server.py):
+
+    python swagger_to_playwright.py swagger-sample.yaml out.spec.ts --profile profile.json
+    python swagger_to_playwright.py ... --profile profile.json --profiler cprofile
+    python swagger_to_playwright.py ... --profile profile.json --profiler sample --tracemalloc
+
+``profile.json`` holds wall and CPU figures per stage. The optional
+profilers write next to it: ``profile.json.pstats`` (cProfile, open with
+``python -m pstats``) and ``profile.json.folded`` (sampled stacks in
+flamegraph "folded" format).
+
+cProfile only sees the thread that started it, so it is limited to the
+single-threaded converters. The mock server handles requests on worker
+threads and accepts ``--profiler sample`` instead, which samples every
+thread.
+
+``--tracemalloc`` turns on memory tracking, which slows every allocation
+and so is off by default. Stages then also report ``peak_bytes``, and a
+raw snapshot is written to ``profile.json.tracemalloc`` with the top
+allocation sites summarised in the JSON file. tracemalloc's peak is
+process-wide, so a stage's peak only counts calls that ran while no other
+stage was open; calls that overlapped another stage (concurrent server
+requests) are counted in ``overlapped_calls`` instead.
+"""
+import atexit
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+PROFILER_CHOICES = ('none', 'cprofile', 'sample')
+_NULL_STAGE = nullcontext()
+
+
+class NullProfiler:
+    """Profiler used when ``--profile`` is not given; every hook is a no-op."""
+
+    enabled = False
+
+    def stage(self, name):
+        return _NULL_STAGE
+
+    def start(self):
+        pass
+
+    def write(self):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class _Stage:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        if self.profiler.track_memory:
+            self.profiler._enter_memory_stage(self)
+        self.start_cpu = time.thread_time()
+        self.start_wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.start_wall
+        cpu = time.thread_time() - self.start_cpu
+        peak = None
+        if self.profiler.track_memory:
+            peak = self.profiler._exit_memory_stage(self)
+        self.profiler.record(self.name, wall, cpu, peak)
+        return False
+
+
+class _Sampler(threading.Thread):
+    """Wall-clock sampling profiler that collects folded stacks per thread."""
+
+    def __init__(self, interval):
+        super().__init__(name='profiling-sampler', daemon=True)
+        self.interval = interval
+        self.counts = {}
+        self._stop_event = threading.Event()
+
+    def run(self):
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})')
+                    frame = frame.f_back
+                key = ';'.join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class StageProfiler:
+    """Collects per-stage timings and writes them to ``output_path`` as JSON."""
+
+    enabled = True
+
+    def __init__(self, output_path, profiler='none', track_memory=False,
+                 snapshot=False, sample_interval=0.005):
+        if profiler not in PROFILER_CHOICES:
+            raise ValueError(f"Unknown profiler '{profiler}', expected one of {', '.join(PROFILER_CHOICES)}")
+        self.output_path = output_path
+        self.profiler = profiler
+        self.track_memory = track_memory or snapshot
+        self.snapshot = snapshot
+        self.sample_interval = sample_interval
+        self.stages = {}
+        self._lock = threading.Lock()
+        # Open memory-tracked stages, and how many times one opened while another was open
+        self._open_stages = 0
+        self._overlaps = 0
+        self._cprofile = None
+        self._sampler = None
+        self._started = None
+        self._written = False
+
+    def start(self):
+        self._started = time.perf_counter()
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.profiler == 'cprofile':
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        elif self.profiler == 'sample':
+            self._sampler = _Sampler(self.sample_interval)
+            self._sampler.start()
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def _enter_memory_stage(self, stage):
+        with self._lock:
+            self._open_stages += 1
+            stage.alone = self._open_stages == 1
+            if stage.alone:
+                # Resetting the process-wide peak is only safe with no other stage open
+                tracemalloc.reset_peak()
+                stage.start_mem = tracemalloc.get_traced_memory()[0]
+            else:
+                self._overlaps += 1
+            stage.start_overlaps = self._overlaps
+
+    def _exit_memory_stage(self, stage):
+        """The stage's peak in bytes, or None when another stage overlapped it."""
+        with self._lock:
+            self._open_stages -= 1
+            if stage.alone and self._overlaps == stage.start_overlaps:
+                return max(tracemalloc.get_traced_memory()[1] - stage.start_mem, 0)
+            return None
+
+    def record(self, name, wall, cpu, peak):
+        with self._lock:
+            entry = self.stages.get(name)
+            if entry is None:
+                entry = self.stages[name] = {
+                    'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'max_wall_s': 0.0,
+                }
+                if self.track_memory:
+                    entry.update(peak_bytes=0, overlapped_calls=0)
+            entry['calls'] += 1
+            entry['wall_s'] += wall
+            entry['cpu_s'] += cpu
+            entry['max_wall_s'] = max(entry['max_wall_s'], wall)
+            if self.track_memory:
+                if peak is None:
+                    entry['overlapped_calls'] += 1
+                else:
+                    entry['peak_bytes'] = max(entry['peak_bytes'], peak)
+
+    def write(self):
+        if self._written:
+            return
+        self._written = True
+
+        report = {
+            'command': sys.argv,
+            'total_wall_s': time.perf_counter() - self._started if self._started else None,
+            'stages': self.stages,
+        }
+
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.output_path + '.pstats')
+            report['cprofile'] = self.output_path + '.pstats'
+
+        if self._sampler is not None:
+            self._sampler.stop()
+            with open(self.output_path + '.folded', 'w') as f:
+                for stack, count in sorted(self._sampler.counts.items()):
+                    f.write(f'{stack} {count}\n')
+            report['samples'] = self.output_path + '.folded'
+
+        if self.track_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            report['memory'] = {'current_bytes': current, 'peak_bytes': peak}
+            if self.snapshot:
+                snapshot = tracemalloc.take_snapshot()
+                snapshot.dump(self.output_path + '.tracemalloc')
+                report['memory']['snapshot'] = self.output_path + '.tracemalloc'
+                report['memory']['top'] = [
+                    {'location': str(stat.traceback), 'size_bytes': stat.size, 'count': stat.count}
+                    for stat in snapshot.statistics('lineno')[:20]
+                ]
+            tracemalloc.stop()
+
+        with open(self.output_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        print(f"Profile written to {self.output_path}")
+
+
+def parse_profile_args(argv, profilers=PROFILER_CHOICES):
+    """Strip the profiling flags out of ``argv``.
+
+    Returns ``(profiler, remaining_args)``; ``profiler`` is ``NULL_PROFILER``
+    unless ``--profile <path>`` was given. The returned profiler has already
+    been started and registers itself to write its report at exit.
+    ``profilers`` limits which ``--profiler`` values the caller supports;
+    any other value prints an error and exits.
+    """
+    args = []
+    output_path = None
+    profiler_name = 'none'
+    snapshot = False
+
+    it = iter(argv)
+    for arg in it:
+        if arg == '--profile':
+            output_path = next(it, None)
+        elif arg == '--profiler':
+            profiler_name = next(it, 'none')
+        elif arg == '--tracemalloc':
+            snapshot = True
+        else:
+            args.append(arg)
+
+    if profiler_name not in profilers:
+        print(f"--profiler {profiler_name} is not supported here, expected one of {', '.join(profilers)}")
+        sys.exit(1)
+    if output_path is None:
+        return NULL_PROFILER, args
+
+    profiler = StageProfiler(output_path, profiler=profiler_name, snapshot=snapshot)
+    profiler.start()
+    atexit.register(profiler.write)
+    return profiler, args
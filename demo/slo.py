@@ -0,0 +1,103 @@
+"""Latency budgets (SLOs) declared on operations.
+
+OpenAPI operations declare them with an ``x-slo`` extension:
+
+    get:
+      x-slo: {p95: 120ms, p99: 250ms}
+
+Postman requests declare them on one line of the request description:
+
+    x-slo: p95=120ms, p99=250ms
+
+Budgets are keyed ``p<percentile>``, ``max`` or ``avg``; values are
+milliseconds unless suffixed with ``s``. Every budget is normalised to a
+float number of milliseconds.
+"""
+import re
+
+_KEY = r'p\d+(?:\.\d+)?|max|avg'
+_KEY_PATTERN = re.compile(_KEY, re.IGNORECASE)
+_BUDGET_PATTERN = re.compile(rf'({_KEY})\s*[:=]\s*(\d+(?:\.\d+)?)\s*(ms|s)?', re.IGNORECASE)
+_DESCRIPTION_PATTERN = re.compile(r'x-slo\s*:\s*(.+)', re.IGNORECASE)
+
+
+def _to_ms(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    m = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*(ms|s)?\s*', str(value), re.IGNORECASE)
+    if m is None:
+        raise ValueError(f"Invalid latency budget '{value}'")
+    return float(m.group(1)) * (1000 if (m.group(2) or '').lower() == 's' else 1)
+
+
+def parse_slo(value):
+    """Normalise an ``x-slo`` value (mapping or ``"p95=120ms"`` string) to ``{key: ms}``."""
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        for key in value:
+            if not _KEY_PATTERN.fullmatch(str(key)):
+                raise ValueError(f"Unknown SLO key '{key}', expected pNN, max or avg")
+        return {str(key).lower(): _to_ms(budget) for key, budget in value.items()}
+    return {
+        key.lower(): _to_ms(number + (unit or ''))
+        for key, number, unit in _BUDGET_PATTERN.findall(str(value))
+    }
+
+
+def operation_slo(operation):
+    return parse_slo(operation.get('x-slo')) if isinstance(operation, dict) else {}
+
+
+def postman_slo(request):
+    description = request.get('description') or ''
+    if isinstance(description, dict):
+        description = description.get('content', '')
+    m = _DESCRIPTION_PATTERN.search(description)
+    return parse_slo(m.group(1)) if m else {}
+
+
+def sample_budget(slo):
+    """Budget for a single timed request.
+
+    One sample cannot show a percentile, so it is checked against the loosest
+    declared bound; the load-test listener enforces the percentiles themselves.
+    """
+    budgets = [budget for key, budget in slo.items() if key != 'avg']
+    return max(budgets) if budgets else None
+
+
+# Appended to generated locustfiles; expects a module-level SLOS table of
+# {(request name, HTTP method): {budget key: ms}}.
+LOCUST_SLO_CHECK = '''
+
+def _observed_ms(entry, key):
+    if key == "max":
+        return entry.max_response_time
+    if key == "avg":
+        return entry.avg_response_time
+    return entry.get_response_time_percentile(float(key[1:]) / 100)
+
+
+@events.quitting.add_listener
+def check_slos(environment, **kwargs):
+    """Fail the run (exit code 1) when any declared latency budget is exceeded."""
+    breaches = []
+    for (name, method), budgets in SLOS.items():
+        entry = environment.stats.entries.get((name, method))
+        if entry is None or not entry.num_requests:
+            continue
+        for key, budget in budgets.items():
+            observed = _observed_ms(entry, key)
+            if observed > budget:
+                breaches.append(f"{method} {name}: {key} {observed:.0f}ms > {budget:g}ms")
+    for breach in breaches:
+        print(f"SLO breached: {breach}")
+    if breaches:
+        environment.process_exit_code = 1
+'''
+
+
+def render_slo_table(slos):
+    """Render ``{(name, method): slo}`` as the body of a generated ``SLOS`` dict."""
+    return ''.join(f'    {(name, method)!r}: {slo!r},\n' for (name, method), slo in slos.items() if slo)
@@ -0,0 +1,288 @@
+"""Spec-driven mock API: routes and responses built straight from an OpenAPI file.
+
+Every operation in the spec gets a route. Its response comes from the
+first 2xx response (or ``default``): a literal ``example``/``examples``
+value where the spec has one, otherwise a value generated from the
+schema. Responses are serialized once at startup, so serving a request
+is a dict or regex lookup followed by returning cached bytes.
+
+Usage (through the mock server):
+    python mock-api-server.py --spec swagger-sample.yaml
+"""
+import json
+import re
+from http import HTTPStatus
+
+import yaml
+
+from profiling import NULL_PROFILER
+
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+MAX_SCHEMA_DEPTH = 8
+
+_PARAM_PATTERN = re.compile(r'\{[^/}]+\}')
+_FORMAT_EXAMPLES = {
+    'date': '2025-01-01',
+    'date-time': '2025-01-01T00:00:00Z',
+    'email': 'user@example.com',
+    'uuid': '00000000-0000-4000-8000-000000000000',
+    'uri': 'https://example.com',
+    'hostname': 'example.com',
+    'ipv4': '127.0.0.1',
+}
+
+
+def load_spec(spec_path):
+    with open(spec_path, 'r') as f:
+        if spec_path.endswith('.json'):
+            return json.load(f)
+        return yaml.safe_load(f)
+
+
+def _status_line(code):
+    try:
+        return f'{code} {HTTPStatus(code).phrase}'
+    except ValueError:
+        return f'{code} Unknown'
+
+
+def _json_response(code, payload):
+    body = json.dumps(payload).encode('utf-8')
+    headers = [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))]
+    return _status_line(code), headers, body
+
+
+NOT_FOUND = _json_response(404, {"error": "Not found"})
+METHOD_NOT_ALLOWED = _json_response(405, {"error": "Method not allowed"})
+
+
+class SchemaExampleBuilder:
+    """Builds an example value for a schema, resolving local ``$ref`` pointers."""
+
+    def __init__(self, spec):
+        self.spec = spec
+
+    def resolve(self, schema):
+        seen = set()
+        while isinstance(schema, dict) and '$ref' in schema:
+            ref = schema['$ref']
+            if ref in seen or not ref.startswith('#/'):
+                return {}
+            seen.add(ref)
+            node = self.spec
+            for part in ref[2:].split('/'):
+                node = node.get(part.replace('~1', '/').replace('~0', '~'), {}) if isinstance(node, dict) else {}
+            schema = node
+        return schema if isinstance(schema, dict) else {}
+
+    def build(self, schema, depth=0):
+        schema = self.resolve(schema)
+        if 'example' in schema:
+            return schema['example']
+        if 'default' in schema:
+            return schema['default']
+        if 'enum' in schema and schema['enum']:
+            return schema['enum'][0]
+        if depth >= MAX_SCHEMA_DEPTH:
+            return None
+
+        if 'allOf' in schema:
+            merged = {}
+            for part in schema['allOf']:
+                value = self.build(part, depth + 1)
+                if isinstance(value, dict):
+                    merged.update(value)
+            return merged
+        for key in ('oneOf', 'anyOf'):
+            if schema.get(key):
+                return self.build(schema[key][0], depth + 1)
+
+        schema_type = schema.get('type')
+        if isinstance(schema_type, list):
+            schema_type = next((t for t in schema_type if t != 'null'), None)
+        if schema_type is None:
+            schema_type = 'object' if 'properties' in schema else 'array' if 'items' in schema else None
+
+        if schema_type == 'object':
+            return {
+                name: self.build(prop, depth + 1)
+                for name, prop in schema.get('properties', {}).items()
+            }
+        if schema_type == 'array':
+            return [self.build(schema.get('items', {}), depth + 1)]
+        if schema_type == 'integer':
+            return schema.get('minimum', 1)
+        if schema_type == 'number':
+            return float(schema.get('minimum', 1.0))
+        if schema_type == 'boolean':
+            return True
+        if schema_type == 'string':
+            return _FORMAT_EXAMPLES.get(schema.get('format'), 'string')
+        return None
+
+
+def _pick_response(responses):
+    """Return ``(status code, response object)`` for the first 2xx response, else ``default``."""
+    # Unquoted YAML codes (200:) load as ints
+    responses = {str(code): response for code, response in responses.items()}
+    codes = sorted(responses)
+    for code in codes:
+        if code.startswith('2') and code.isdigit():
+            return int(code), responses[code] or {}
+    if 'default' in responses:
+        return 200, responses['default'] or {}
+    if codes and codes[0].isdigit():
+        return int(codes[0]), responses[codes[0]] or {}
+    return 200, {}
+
+
+def build_response(operation, builder):
+    """Serialize the mock response for one operation as ``(status, headers, body)``."""
+    code, response = _pick_response(operation.get('responses') or {'200': {}})
+    response = builder.resolve(response)
+
+    media_type = 'application/json'
+    value = None
+    if 'content' in response:
+        # OpenAPI 3
+        content = response['content'] or {}
+        media_type = next((mt for mt in content if 'json' in mt), next(iter(content), media_type))
+        media = content.get(media_type) or {}
+        if 'example' in media:
+            value = media['example']
+        elif media.get('examples'):
+            example = builder.resolve(next(iter(media['examples'].values())))
+            value = example.get('value')
+        elif 'schema' in media:
+            value = builder.build(media['schema'])
+    elif 'examples' in response and response['examples']:
+        # Swagger 2
+        media_type = next(iter(response['examples']))
+        value = response['examples'][media_type]
+    elif 'schema' in response:
+        value = builder.build(response['schema'])
+
+    if code == 204 or (value is None and 'json' not in media_type):
+        body = b''
+    elif 'json' in media_type:
+        body = json.dumps(value).encode('utf-8')
+    else:
+        body = str(value).encode('utf-8')
+
+    headers = [('Content-Type', media_type), ('Content-Length', str(len(body)))]
+    return _status_line(code), headers, body
+
+
+def is_templated(path):
+    return _PARAM_PATTERN.search(path) is not None
+
+
+def path_pattern(path):
+    """Regex source matching ``path`` with each ``{param}`` standing for one segment."""
+    return '[^/]+'.join(re.escape(part) for part in _PARAM_PATTERN.split(path))
+
+
+def _base_path(spec):
+    if 'basePath' in spec:
+        path = spec['basePath']
+    else:
+        servers = spec.get('servers') or [{}]
+        url = servers[0].get('url', '')
+        path = re.sub(r'^[a-z]+://[^/]+', '', url)
+    return path.rstrip('/')
+
+
+class SpecRouter:
+    """Precompiled path matcher.
+
+    Literal paths are a single dict lookup. Templated paths are grouped by
+    segment count, and each group is compiled into one alternation regex
+    whose outer named group identifies the route. Literal paths win over
+    templated ones, as the OpenAPI spec requires.
+    """
+
+    def __init__(self, spec):
+        builder = SchemaExampleBuilder(spec)
+        prefix = _base_path(spec)
+        self.static = {}
+        self.routes = []
+        patterns_by_segments = {}
+
+        for template, path_item in (spec.get('paths') or {}).items():
+            path_item = builder.resolve(path_item)
+            methods = {}
+            for method, operation in path_item.items():
+                if method in HTTP_METHODS and isinstance(operation, dict):
+                    methods[method.upper()] = build_response(operation, builder)
+            if 'GET' in methods and 'HEAD' not in methods:
+                status, headers, _ = methods['GET']
+                methods['HEAD'] = (status, headers, b'')
+
+            full_path = prefix + template
+            entry = (full_path, methods)
+            if not is_templated(template):
+                self.static[full_path.rstrip('/') or '/'] = entry
+                continue
+
+            index = len(self.routes)
+            self.routes.append(entry)
+            segments = full_path.count('/')
+            patterns_by_segments.setdefault(segments, []).append(f'(?P<r{index}>{path_pattern(full_path)})')
+
+        self.dynamic = {
+            segments: re.compile('|'.join(patterns))
+            for segments, patterns in patterns_by_segments.items()
+        }
+
+    def match(self, path):
+        """Return ``(template, {METHOD: response})`` for ``path``, or None."""
+        if len(path) > 1:
+            path = path.rstrip('/')
+        entry = self.static.get(path)
+        if entry is not None:
+            return entry
+        regex = self.dynamic.get(path.count('/'))
+        if regex is not None:
+            m = regex.fullmatch(path)
+            if m is not None:
+                return self.routes[int(m.lastgroup[1:])]
+        return None
+
+
+class SpecMockApp:
+    """WSGI app serving the precomputed responses of a :class:`SpecRouter`."""
+
+    def __init__(self, spec, profiler=NULL_PROFILER):
+        self.router = SpecRouter(spec)
+        self.profiler = profiler
+
+    def respond(self, method, path):
+        entry = self.router.match(path)
+        if entry is None:
+            return None, NOT_FOUND
+        template, methods = entry
+        response = methods.get(method)
+        if response is None:
+            return template, METHOD_NOT_ALLOWED
+        return template, response
+
+    def __call__(self, environ, start_response):
+        method = environ['REQUEST_METHOD']
+        path = environ.get('PATH_INFO') or '/'
+        if self.profiler.enabled:
+            stage = self.profiler.stage(method)
+            with stage:
+                template, (status, headers, body) = self.respond(method, path)
+                # Name the stage after the route template once it is known.
+                stage.name = f'{method} {template or "<unmatched>"}'
+        else:
+            template, (status, headers, body) = self.respond(method, path)
+        start_response(status, headers)
+        return [body]
+
+    def describe(self):
+        """Yield ``METHOD path`` for every route, for the startup banner."""
+        for template, methods in list(self.router.static.values()) + self.router.routes:
+            for method in methods:
+                if method != 'HEAD':
+                    yield f'{method} {template}'
@@ -1,6 +1,11 @@
+import re
 import sys
 import yaml
 
+from profiling import NULL_PROFILER, parse_profile_args
+from slo import LOCUST_SLO_CHECK, operation_slo, render_slo_table
+from spec_mock import HTTP_METHODS, SchemaExampleBuilder
+
 TEMPLATE = '''from locust import HttpUser, task
 
 class SwaggerUser(HttpUser):
@@ -9,16 +14,84 @@ class SwaggerUser(HttpUser):
         self.client.get("/hello")
 '''
 
-def main(swagger_path, output_path):
+# One task per operation; requests are named after the spec path so Locust
+# reports templated paths such as /users/{userId} as a single entry.
+OPERATIONS_TEMPLATE = '''from locust import HttpUser, events, task
+
+# Latency budgets in ms declared with x-slo, keyed by (request name, HTTP method)
+SLOS = {{
+{slos}}}
+
+class SwaggerUser(HttpUser):
+{tasks}
+'''
+
+TASK_TEMPLATE = '''    @task
+    def {task_name}(self):
+        self.client.request({method!r}, {url!r}, name={name!r}{body})
+'''
+
+def _task_name(method, path, used):
+    base = re.sub(r'\W+', '_', f'{method} {path}').strip('_').lower()
+    name, n = base, 2
+    while name in used:
+        name, n = f'{base}_{n}', n + 1
+    used.add(name)
+    return name
+
+def generate_operations(spec):
+    """Return ``(method, path, example url, json body or None, slo)`` for every operation."""
+    builder = SchemaExampleBuilder(spec)
+    operations = []
+    for path, methods in (spec.get('paths') or {}).items():
+        for method, details in methods.items():
+            if method.lower() not in HTTP_METHODS:
+                continue
+            details = details or {}
+            content = (details.get('requestBody') or {}).get('content', {})
+            body = None
+            if 'application/json' in content:
+                body = builder.build(content['application/json'].get('schema', {}))
+            url = re.sub(r'\{[^/}]+\}', '1', path)
+            operations.append((method.upper(), path, url, body, operation_slo(details)))
+    return operations
+
+def load_spec(swagger_path):
     with open(swagger_path, 'r') as f:
-        spec = yaml.safe_load(f)
-    # For demo, just output a static Locust script for /hello
-    with open(output_path, 'w') as f:
-        f.write(TEMPLATE)
+        return yaml.safe_load(f)
+
+def render(spec, swagger_path, profiler=NULL_PROFILER):
+    with profiler.stage('generate'):
+        operations = generate_operations(spec)
+    if not operations:
+        return TEMPLATE
+    with profiler.stage('render'):
+        used = set()
+        tasks = '\n'.join(
+            TASK_TEMPLATE.format(
+                task_name=_task_name(method, path, used),
+                method=method,
+                url=url,
+                name=path,
+                body=f', json={body!r}' if body is not None else ''
+            )
+            for method, path, url, body, _ in operations
+        )
+        slos = render_slo_table({(path, method): slo for method, path, _, _, slo in operations})
+        return OPERATIONS_TEMPLATE.format(slos=slos, tasks=tasks.rstrip('\n')) + LOCUST_SLO_CHECK
+
+def main(swagger_path, output_path, profiler=NULL_PROFILER):
+    with profiler.stage('load'):
+        spec = load_spec(swagger_path)
+    locust_code = render(spec, swagger_path, profiler)
+    with profiler.stage('write'):
+        with open(output_path, 'w') as f:
+            f.write(locust_code)
     print(f"Locust script generated at {output_path}")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python swagger_to_locust.py <swagger.yaml> <output.py>")
+    profiler, args = parse_profile_args(sys.argv[1:])
+    if len(args) != 2:
+        print("Usage: python swagger_to_locust.py <swagger.yaml> <output.py> [--profile <profile.json>]")
         sys.exit(1)
-    main(sys.argv[1], sys.argv[2])
+    main(args[0], args[1], profiler)
@@ -2,7 +2,11 @@ import sys
 import yaml
 import json
 
-PLAYWRIGHT_TEMPLATE = '''import {{ test, expect }} from '@playwright/test';
+from profiling import NULL_PROFILER, parse_profile_args
+from slo import operation_slo, sample_budget
+from tenant_fixture import TENANT_TEST_IMPORTS
+
+PLAYWRIGHT_TEMPLATE = '''{test_imports}
 
 // Generated from Swagger: {swagger_file}
 test.describe('API Tests from Swagger', () => {{
@@ -19,42 +23,122 @@ TEST_METHOD_TEMPLATE = '''
     console.log('Response:', responseData);
   }});'''
 
-def generate_test_methods(spec):
-    test_methods = []
+# Used for operations that declare an x-slo latency budget
+TEST_METHOD_SLO_TEMPLATE = '''
+  test('{method_name}', async ({{ request }}) => {{
+    const started = performance.now();
+    const response = await request.{http_method}('{endpoint}');
+    const elapsed = performance.now() - started;
+    test.info().annotations.push({{ type: 'latency-ms', description: elapsed.toFixed(1) }});
+    expect(response.status()).toBe(200);
+    expect.soft(elapsed, 'latency budget {budget}ms').toBeLessThanOrEqual({budget});
+
+    const responseData = await response.json();
+    console.log('Response:', responseData);
+  }});'''
+
+# Compact output: one parameterized test loop over a case table, so the
+# generated file grows with the number of operations rather than with code.
+COMPACT_PLAYWRIGHT_TEMPLATE = '''{test_imports}
+
+// Generated from Swagger: {swagger_file}
+// [test name, HTTP method, endpoint, x-slo latency budget in ms]
+const cases: [string, string, string, number | null][] = [
+{test_cases}
+];
+
+test.describe('API Tests from Swagger', () => {{
+  if (cases.length === 0) test.skip('No API endpoints found', () => {{}});
+
+  for (const [name, method, endpoint, budgetMs] of cases) {{
+    test(name, async ({{ request }}) => {{
+      const started = performance.now();
+      const response = await request.fetch(endpoint, {{ method }});
+      const elapsed = performance.now() - started;
+      expect(response.status()).toBe(200);
+      if (budgetMs !== null) {{
+        test.info().annotations.push({{ type: 'latency-ms', description: elapsed.toFixed(1) }});
+        expect.soft(elapsed, `latency budget ${{budgetMs}}ms`).toBeLessThanOrEqual(budgetMs);
+      }}
+
+      const responseData = await response.json();
+      console.log('Response:', responseData);
+    }});
+  }}
+}});
+'''
+
+def generate_test_cases(spec):
+    test_cases = []
     
     if 'paths' in spec:
         for path, methods in spec['paths'].items():
             for method, details in methods.items():
-                method_name = f'{method.upper()} {path}'
-                test_method = TEST_METHOD_TEMPLATE.format(
-                    method_name=method_name,
-                    http_method=method.lower(),
-                    endpoint=path
-                )
-                test_methods.append(test_method)
+                budget = sample_budget(operation_slo(details))
+                test_cases.append((f'{method.upper()} {path}', method.lower(), path, budget))
+    
+    return test_cases
+
+def generate_test_methods(spec):
+    test_methods = []
+    
+    for method_name, http_method, endpoint, budget in generate_test_cases(spec):
+        template = TEST_METHOD_TEMPLATE if budget is None else TEST_METHOD_SLO_TEMPLATE
+        test_method = template.format(
+            method_name=method_name,
+            http_method=http_method,
+            endpoint=endpoint,
+            budget=f'{budget:g}' if budget is not None else None
+        )
+        test_methods.append(test_method)
     
     return '\\n'.join(test_methods) if test_methods else '\\n  test.skip("No API endpoints found", () => {});'
 
-def main(swagger_path, output_path):
+def load_spec(swagger_path):
     with open(swagger_path, 'r') as f:
         if swagger_path.endswith('.json'):
-            spec = json.load(f)
-        else:
-            spec = yaml.safe_load(f)
+            return json.load(f)
+        return yaml.safe_load(f)
+
+def render_compact(spec, swagger_path, profiler=NULL_PROFILER):
+    with profiler.stage('generate'):
+        test_cases = ',\n'.join(f'  {json.dumps(list(case))}' for case in generate_test_cases(spec))
+    with profiler.stage('render'):
+        return COMPACT_PLAYWRIGHT_TEMPLATE.format(
+            test_imports=TENANT_TEST_IMPORTS,
+            swagger_file=swagger_path,
+            test_cases=test_cases
+        )
+
+def render(spec, swagger_path, profiler=NULL_PROFILER, compact=False):
+    if compact:
+        return render_compact(spec, swagger_path, profiler)
+    with profiler.stage('generate'):
+        test_methods = generate_test_methods(spec)
+    with profiler.stage('render'):
+        return PLAYWRIGHT_TEMPLATE.format(
+            test_imports=TENANT_TEST_IMPORTS,
+            swagger_file=swagger_path,
+            test_methods=test_methods
+        )
+
+def main(swagger_path, output_path, profiler=NULL_PROFILER, compact=False):
+    with profiler.stage('load'):
+        spec = load_spec(swagger_path)
     
-    test_methods = generate_test_methods(spec)
-    playwright_code = PLAYWRIGHT_TEMPLATE.format(
-        swagger_file=swagger_path,
-        test_methods=test_methods
-    )
+    playwright_code = render(spec, swagger_path, profiler, compact)
     
-    with open(output_path, 'w') as f:
-        f.write(playwright_code)
+    with profiler.stage('write'):
+        with open(output_path, 'w') as f:
+            f.write(playwright_code)
     
     print(f"Playwright test generated at {output_path}")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python swagger_to_playwright.py <swagger.yaml> <output.spec.ts>")
+    profiler, args = parse_profile_args(sys.argv[1:])
+    compact = '--compact' in args
+    args = [arg for arg in args if arg != '--compact']
+    if len(args) != 2:
+        print("Usage: python swagger_to_playwright.py <swagger.yaml> <output.spec.ts> [--compact] [--profile <profile.json>]")
         sys.exit(1)
-    main(sys.argv[1], sys.argv[2])
+    main(args[0], args[1], profiler, compact)
@@ -2,6 +2,8 @@ import sys
 import yaml
 import json
 
+from profiling import NULL_PROFILER, parse_profile_args
+
 MCP_PLAYWRIGHT_TEMPLATE = '''/**
  * MCP Playwright Test Commands
  * Generated from Swagger: {swagger_file}
@@ -65,26 +67,36 @@ def generate_mcp_commands(spec):
     
     return ',\\n'.join(commands) if commands else '// No API endpoints found'
 
-def main(swagger_path, output_path):
+def load_spec(swagger_path):
     with open(swagger_path, 'r') as f:
         if swagger_path.endswith('.json'):
-            spec = json.load(f)
-        else:
-            spec = yaml.safe_load(f)
+            return json.load(f)
+        return yaml.safe_load(f)
+
+def render(spec, swagger_path, profiler=NULL_PROFILER):
+    with profiler.stage('generate'):
+        test_commands = generate_mcp_commands(spec)
+    with profiler.stage('render'):
+        return MCP_PLAYWRIGHT_TEMPLATE.format(
+            swagger_file=swagger_path,
+            test_commands=test_commands
+        )
+
+def main(swagger_path, output_path, profiler=NULL_PROFILER):
+    with profiler.stage('load'):
+        spec = load_spec(swagger_path)
     
-    test_commands = generate_mcp_commands(spec)
-    mcp_script = MCP_PLAYWRIGHT_TEMPLATE.format(
-        swagger_file=swagger_path,
-        test_commands=test_commands
-    )
+    mcp_script = render(spec, swagger_path, profiler)
     
-    with open(output_path, 'w') as f:
-        f.write(mcp_script)
+    with profiler.stage('write'):
+        with open(output_path, 'w') as f:
+            f.write(mcp_script)
     
     print(f"MCP Playwright commands generated at {output_path}")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python swagger_to_playwright_mcp.py <swagger.yaml> <output.js>")
+    profiler, args = parse_profile_args(sys.argv[1:])
+    if len(args) != 2:
+        print("Usage: python swagger_to_playwright_mcp.py <swagger.yaml> <output.js> [--profile <profile.json>]")
         sys.exit(1)
-    main(sys.argv[1], sys.argv[2])
+    main(args[0], args[1], profiler)
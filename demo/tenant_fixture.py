@@ -0,0 +1,32 @@
+"""Per-worker mock-server tenant for the generated Playwright API tests.
+
+Replaces the ``@playwright/test`` import at the top of generated files.
+Each worker process gets its own tenant (``worker-<workerIndex>``). The
+index is unique per process, so a worker that replaces a failed one, or
+runs a retry, starts on a new tenant. The tenant is reset when the worker
+starts, so reruns against a long-running server start from the seed data
+as well.
+
+The header is added to the ``request`` fixture's options only, and the
+generated tests call nothing but the mock server at ``baseURL``, so it is
+never sent to other hosts.
+"""
+
+TENANT_TEST_IMPORTS = '''import { test as base, expect } from '@playwright/test';
+
+// Isolated mock-server data per worker (see mock-api-server.py tenants)
+const test = base.extend<{}, { tenant: string }>({
+  tenant: [async ({ playwright }, use, workerInfo) => {
+    const tenant = `worker-${workerInfo.workerIndex}`;
+    const baseURL = workerInfo.project.use.baseURL;
+    if (baseURL) {
+      const api = await playwright.request.newContext({ baseURL });
+      await api.post(`/tenants/${tenant}/reset`).catch(() => undefined);
+      await api.dispose();
+    }
+    await use(tenant);
+  }, { scope: 'worker' }],
+  extraHTTPHeaders: async ({ extraHTTPHeaders, tenant }, use) => {
+    await use({ ...extraHTTPHeaders, 'X-Tenant': tenant });
+  },
+});'''
@@ -0,0 +1,400 @@
+"""Backing store for the mock server's users.
+
+Without a data directory this is the old behaviour: two hardcoded users held
+in memory and lost on restart.
+
+With a data directory, users are persisted in three files:
+
+* ``users.snapshot`` - a compact, memory-mapped snapshot. Records are the
+  compact JSON encoding of each user, stored back to back after a small
+  header, so opening even ten million users is a single ``mmap`` call and
+  records are decoded only when they are read.
+* ``users.index`` - the snapshot's offset table, one uint64 per record.
+* ``users.log`` - an append-only NDJSON log of users created since the last
+  compaction. It is replayed on startup and appended to the snapshot every
+  ``compact_every`` writes.
+
+Compaction only appends: the logged records go after the snapshot's data,
+their offsets after the index, and the header's record count is updated
+last. Its cost depends on the size of the log, not of the snapshot. After a
+crash, bytes past the header's counts are ignored and overwritten by the
+next compaction.
+
+User ids are dense (1..N), exactly as the mock server has always assigned
+them, so a record's position in the snapshot is ``id - 1``.
+
+Every user is kept in its encoded JSON form as well (snapshot records are
+already bytes; new users are encoded once when they are written), and list
+pages are cached as assembled bytes until the next write, so read-heavy
+traffic is served without re-encoding anything. Listing without a limit is
+capped at ``DEFAULT_PAGE_SIZE`` users when a data directory is in use.
+
+A store can also be forked into an in-memory, copy-on-write tenant (see
+``TenantRegistry``): the tenant reads the parent's first N users straight
+from the parent and keeps the users it creates to itself. Because ids are
+dense and users are never modified, forking and dropping a tenant are O(1).
+
+Seed a large dataset without going through HTTP:
+    python user_store.py seed <data-dir> <count>
+"""
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from array import array
+
+from fast_json import dumps, join_array
+
+DEFAULT_USERS = [
+    {"id": 1, "name": "John Doe", "email": "john@example.com"},
+    {"id": 2, "name": "Jane Smith", "email": "jane@example.com"}
+]
+
+SNAPSHOT_FILE = 'users.snapshot'
+INDEX_FILE = 'users.index'
+LOG_FILE = 'users.log'
+COMPACT_EVERY = 100_000
+MAX_CACHED_PAGES = 256
+DEFAULT_PAGE_SIZE = 1000
+TENANT_NAME = re.compile(r'^[A-Za-z0-9_.-]{1,64}$')
+
+# magic, record count, data length; the index is native-endian uint64 offsets
+_MAGIC = b'USRSNAP2'
+_HEADER = struct.Struct('=8sQQ')
+_OFFSET_CHUNK = 1 << 20
+
+
+def encode_user(user):
+    return dumps(user)
+
+
+def _append_snapshot(snapshot_path, index_path, blobs):
+    """Append encoded records to a snapshot and its index, creating them if needed.
+
+    ``blobs`` may be any iterable of encoded records; offsets are written in
+    chunks, so seeding millions of users stays in bounded memory. The header
+    is rewritten only after data and index are on disk.
+    """
+    if not os.path.exists(snapshot_path):
+        with open(snapshot_path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, 0, 0))
+        with open(index_path, 'wb') as f:
+            array('Q', [0]).tofile(f)
+
+    with open(snapshot_path, 'r+b') as data_file, open(index_path, 'r+b') as index_file:
+        magic, count, data_len = _HEADER.unpack(data_file.read(_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError(f"{snapshot_path} is not a user snapshot")
+        data_file.seek(_HEADER.size + data_len)
+        index_file.seek(8 * (count + 1))
+        offsets = array('Q')
+        for blob in blobs:
+            data_file.write(blob)
+            data_len += len(blob)
+            offsets.append(data_len)
+            if len(offsets) >= _OFFSET_CHUNK:
+                offsets.tofile(index_file)
+                count += len(offsets)
+                offsets = array('Q')
+        offsets.tofile(index_file)
+        count += len(offsets)
+
+        for f in (data_file, index_file):
+            f.flush()
+            os.fsync(f.fileno())
+        data_file.seek(0)
+        data_file.write(_HEADER.pack(_MAGIC, count, data_len))
+        data_file.flush()
+        os.fsync(data_file.fileno())
+
+
+class Snapshot:
+    """Read-only view over a memory-mapped snapshot and its index."""
+
+    def __init__(self, path, index_path):
+        self._files = []
+        self._maps = []
+        data_map = self._map(path)
+        magic, self.count, self.data_len = _HEADER.unpack_from(data_map, 0)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a user snapshot; re-run 'python user_store.py seed'")
+        index_map = self._map(index_path)
+        self.data = memoryview(data_map)[_HEADER.size:_HEADER.size + self.data_len]
+        self.offsets = memoryview(index_map)[:8 * (self.count + 1)].cast('Q')
+
+    def _map(self, path):
+        f = open(path, 'rb')
+        self._files.append(f)
+        self._maps.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        return self._maps[-1]
+
+    def get_raw(self, index):
+        return bytes(self.data[self.offsets[index]:self.offsets[index + 1]])
+
+    def close(self):
+        # Views must be released before the mappings can be closed.
+        for name in ('offsets', 'data'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        for m in self._maps:
+            m.close()
+        for f in self._files:
+            f.close()
+
+
+class _ForkBase:
+    """Stands in for a snapshot: the first ``count`` users of a parent store."""
+
+    def __init__(self, parent, count):
+        self.parent = parent
+        self.count = count
+
+    def get_raw(self, index):
+        return self.parent.get_raw(index + 1)
+
+    def close(self):
+        pass
+
+
+class UserStore:
+    def __init__(self, data_dir=None, compact_every=COMPACT_EVERY, base=None):
+        self.data_dir = data_dir
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._snapshot = base
+        self._tail = []
+        self._tail_raw = []
+        self._pages = {}
+        self._log = None
+        # Upper bound for page_raw() without a limit; None lists everything
+        self.page_size = None
+
+        if base is not None:
+            self.page_size = base.parent.page_size
+            return
+        if data_dir is None:
+            self._append([dict(user) for user in DEFAULT_USERS])
+            return
+
+        os.makedirs(data_dir, exist_ok=True)
+        self.page_size = DEFAULT_PAGE_SIZE
+        self._snapshot_path = os.path.join(data_dir, SNAPSHOT_FILE)
+        self._index_path = os.path.join(data_dir, INDEX_FILE)
+        self._log_path = os.path.join(data_dir, LOG_FILE)
+        fresh = not os.path.exists(self._snapshot_path) and not os.path.exists(self._log_path)
+
+        if os.path.exists(self._snapshot_path):
+            self._snapshot = Snapshot(self._snapshot_path, self._index_path)
+        self._replay_log()
+        self._log = open(self._log_path, 'ab')
+
+        if fresh:
+            self._append([dict(user) for user in DEFAULT_USERS])
+
+    @property
+    def _base_count(self):
+        return self._snapshot.count if self._snapshot is not None else 0
+
+    def _replay_log(self):
+        if not os.path.exists(self._log_path):
+            return
+        base = self._base_count
+        with open(self._log_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # torn final write from a crash
+                user = json.loads(line)
+                # Entries already folded into the snapshot are skipped, which
+                # covers a crash between writing a snapshot and truncating the log.
+                if user['id'] > base + len(self._tail):
+                    self._tail.append(user)
+                    self._tail_raw.append(line.rstrip(b'\r\n'))
+
+    def _append(self, users):
+        """Store new users and return their encoded JSON."""
+        encoded = [encode_user(user) for user in users]
+        self._tail.extend(users)
+        self._tail_raw.extend(encoded)
+        self._pages.clear()
+        if self._log is not None:
+            self._log.write(b''.join(raw + b'\n' for raw in encoded))
+            self._log.flush()
+            if len(self._tail) >= self.compact_every:
+                self._compact()
+        return encoded
+
+    def __len__(self):
+        return self._base_count + len(self._tail)
+
+    # Reads take the lock too, because compaction swaps the snapshot mapping.
+    def _get_raw(self, user_id):
+        index = user_id - 1
+        base = self._base_count
+        if 0 <= index < base:
+            return self._snapshot.get_raw(index)
+        if base <= index < base + len(self._tail_raw):
+            return self._tail_raw[index - base]
+        return None
+
+    def get_raw(self, user_id):
+        """Encoded JSON bytes for ``user_id``, or None."""
+        with self._lock:
+            return self._get_raw(user_id)
+
+    def get_raw_many(self, user_ids):
+        """Encoded JSON bytes for several users under one lock; missing ids map to None."""
+        with self._lock:
+            return [self._get_raw(user_id) for user_id in user_ids]
+
+    def page_raw(self, offset=0, limit=None):
+        """A JSON array of users as bytes, cached until the next write.
+
+        Without a limit, at most ``page_size`` users are returned (all of
+        them for the in-memory store).
+        """
+        if limit is None:
+            limit = self.page_size
+        key = (offset, limit)
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None:
+                end = len(self) if limit is None else min(offset + limit, len(self))
+                page = join_array(self._get_raw(user_id) for user_id in range(offset + 1, end + 1))
+                if len(self._pages) >= MAX_CACHED_PAGES:
+                    self._pages.clear()
+                self._pages[key] = page
+        return page
+
+    def _get(self, user_id):
+        index = user_id - 1
+        base = self._base_count
+        if 0 <= index < base:
+            return json.loads(self._snapshot.get_raw(index))
+        if base <= index < base + len(self._tail):
+            return self._tail[index - base]
+        return None
+
+    def get(self, user_id):
+        with self._lock:
+            return self._get(user_id)
+
+    def create(self, name, email):
+        return self.create_many([(name, email)])[0]
+
+    def create_raw(self, name, email):
+        """Create a user and return its encoded JSON bytes."""
+        return self.create_many_raw([(name, email)])[0]
+
+    def _create_many(self, records):
+        with self._lock:
+            first_id = len(self) + 1
+            users = [
+                {"id": first_id + i, "name": name, "email": email}
+                for i, (name, email) in enumerate(records)
+            ]
+            return users, self._append(users)
+
+    def create_many(self, records):
+        """Create users from ``(name, email)`` pairs with one lock and one log write."""
+        return self._create_many(records)[0]
+
+    def create_many_raw(self, records):
+        """Like ``create_many``, returning each user's encoded JSON bytes."""
+        return self._create_many(records)[1]
+
+    def fork(self):
+        """An in-memory tenant that starts with this store's current users."""
+        return UserStore(base=_ForkBase(self, len(self)))
+
+    def compact(self):
+        if self._log is None:
+            return
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        if not self._tail:
+            return
+        _append_snapshot(self._snapshot_path, self._index_path, self._tail_raw)
+        # Remap so the new records are visible; mappings have a fixed size.
+        if self._snapshot is not None:
+            self._snapshot.close()
+        self._snapshot = Snapshot(self._snapshot_path, self._index_path)
+        self._log.truncate(0)
+        self._tail = []
+        self._tail_raw = []
+
+    def close(self):
+        with self._lock:
+            self._pages.clear()
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            if self._snapshot is not None:
+                self._snapshot.close()
+                self._snapshot = None
+
+
+class TenantRegistry:
+    """Named tenants, each a copy-on-write fork of one seed store.
+
+    Tenants are forked lazily on first use; resetting one just drops its
+    fork, so the next request starts again from the seed data.
+    """
+
+    def __init__(self, seed_store):
+        self.seed_store = seed_store
+        self._lock = threading.Lock()
+        self._tenants = {}
+
+    def get(self, tenant=None):
+        """The store for ``tenant``; no tenant means the seed store itself."""
+        if not tenant:
+            return self.seed_store
+        if not TENANT_NAME.match(tenant):
+            raise ValueError(f"Invalid tenant name '{tenant}'")
+        with self._lock:
+            store = self._tenants.get(tenant)
+            if store is None:
+                store = self._tenants[tenant] = self.seed_store.fork()
+        return store
+
+    def reset(self, tenant=None):
+        """Drop one tenant's data, or every tenant's when ``tenant`` is None."""
+        with self._lock:
+            if tenant is None:
+                self._tenants = {}
+            else:
+                self._tenants.pop(tenant, None)
+
+    def __len__(self):
+        return len(self._tenants)
+
+
+def seed(data_dir, count):
+    """Write a fresh snapshot of ``count`` generated users to ``data_dir``."""
+    os.makedirs(data_dir, exist_ok=True)
+    for name in (SNAPSHOT_FILE, INDEX_FILE, LOG_FILE):
+        path = os.path.join(data_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+    # Same bytes as encode_user() would produce, without a json.dumps per record.
+    blobs = (
+        b'{"id":%d,"name":"User %d","email":"user%d@example.com"}' % (i, i, i)
+        for i in range(1, count + 1)
+    )
+    _append_snapshot(os.path.join(data_dir, SNAPSHOT_FILE), os.path.join(data_dir, INDEX_FILE), blobs)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] != 'seed':
+        print("Usage: python user_store.py seed <data-dir> <count>")
+        sys.exit(1)
+    started = time.perf_counter()
+    seed(sys.argv[2], int(sys.argv[3]))
+    print(f"Seeded {int(sys.argv[3]):,} users into {sys.argv[2]} in {time.perf_counter() - started:.1f}s")
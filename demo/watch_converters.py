@@ -0,0 +1,249 @@
+"""Long-running watch mode for the converters.
+
+Keeps every parsed spec/collection in memory, re-parses only the input files
+that change and re-renders only the outputs generated from them. Outputs are
+rewritten only when their content actually changes, so Playwright/Locust
+watchers downstream are not retriggered by no-op regenerations.
+
+Usage:
+    python watch_converters.py <converter> <input> <output> [--compact] [<converter> <input> <output> [--compact] ...]
+
+``--compact`` after a triple applies to that output only, for converters
+that support it (the Playwright ones).
+
+Example:
+    python watch_converters.py \\
+        swagger_to_playwright swagger-sample.yaml tests/swagger-generated.spec.ts --compact \\
+        swagger_to_locust swagger-sample.yaml locust_swagger.py \\
+        postman_to_playwright postman-sample.json tests/postman-generated.spec.ts
+
+An input shared by several outputs is parsed once per change.
+
+Change notifications come from the optional ``watchdog`` package when it is
+installed; otherwise the input files are polled with ``os.stat``.
+"""
+import importlib
+import inspect
+import os
+import sys
+import threading
+import time
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+CONVERTERS = (
+    'swagger_to_playwright',
+    'swagger_to_playwright_mcp',
+    'swagger_to_azure_mcp',
+    'swagger_to_locust',
+    'postman_to_playwright',
+    'postman_to_playwright_mcp',
+    'postman_to_azure_mcp',
+    'postman_to_locust',
+)
+
+POLL_INTERVAL = 0.1
+DEBOUNCE_SECONDS = 0.05
+
+
+def _loader(module):
+    return getattr(module, 'load_spec', None) or module.load_collection
+
+
+def _file_type(path):
+    return 'json' if path.lower().endswith('.json') else 'yaml'
+
+
+class Job:
+    def __init__(self, converter, input_path, output_path, compact=False):
+        if converter.endswith('.py'):
+            converter = converter[:-3]
+        if converter not in CONVERTERS:
+            raise ValueError(f"Unknown converter '{converter}', expected one of {', '.join(CONVERTERS)}")
+        self.converter = converter
+        self.module = importlib.import_module(converter)
+        self.loader = _loader(self.module)
+        self.input_path = input_path
+        self.output_path = output_path
+        self.options = {}
+        if compact:
+            if 'compact' not in inspect.signature(self.module.render).parameters:
+                raise ValueError(f"{converter} does not support --compact")
+            self.options['compact'] = True
+        self.last_output = None
+
+    def render(self, spec):
+        code = self.module.render(spec, self.input_path, **self.options)
+        if code == self.last_output:
+            return False
+        with open(self.output_path, 'w') as f:
+            f.write(code)
+        self.last_output = code
+        return True
+
+
+class SpecCache:
+    """Parsed inputs keyed by (absolute path, file type), invalidated by stat signature.
+
+    The converters' loaders differ only in name, so jobs sharing an input
+    share one parse; whichever job asks first supplies the loader.
+    """
+
+    def __init__(self):
+        self.entries = {}
+
+    @staticmethod
+    def signature(path):
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    def get(self, path, loader):
+        key = (os.path.abspath(path), _file_type(path))
+        signature = self.signature(path)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1], False
+        try:
+            spec = loader(path)
+        except Exception as e:
+            # Editors often save in several steps; keep serving the last good parse.
+            if entry is None:
+                raise
+            print(f"⚠️ Could not parse {path}: {e} (keeping previous version)")
+            return entry[1], False
+        self.entries[key] = (signature, spec)
+        return spec, True
+
+
+class Watcher:
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.cache = SpecCache()
+        self.jobs_by_input = {}
+        for job in jobs:
+            self.jobs_by_input.setdefault(os.path.abspath(job.input_path), []).append(job)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def regenerate(self, path):
+        started = time.perf_counter()
+        written = []
+        for job in self.jobs_by_input.get(path, []):
+            try:
+                spec, _ = self.cache.get(job.input_path, job.loader)
+            except Exception as e:
+                print(f"❌ {job.input_path}: {e}")
+                return
+            try:
+                changed = job.render(spec)
+            except Exception as e:
+                # A bad edit must not stop the watcher; last_output is untouched,
+                # so the next good save rewrites the output.
+                print(f"❌ {job.output_path}: {e}")
+                continue
+            if changed:
+                written.append(job.output_path)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if written:
+            print(f"🔄 {self.jobs_by_input[path][0].input_path} → {', '.join(written)} ({elapsed_ms:.1f} ms)")
+
+    def notify(self, path):
+        path = os.path.abspath(path)
+        if path not in self.jobs_by_input:
+            return
+        with self._lock:
+            self._pending.add(path)
+        self._wakeup.set()
+
+    def _poll(self):
+        signatures = {}
+        for path in self.jobs_by_input:
+            try:
+                signatures[path] = SpecCache.signature(path)
+            except OSError:
+                signatures[path] = None
+        while True:
+            time.sleep(POLL_INTERVAL)
+            for path in self.jobs_by_input:
+                try:
+                    signature = SpecCache.signature(path)
+                except OSError:
+                    signature = None
+                if signature != signatures[path]:
+                    signatures[path] = signature
+                    self.notify(path)
+
+    def _start_observer(self):
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                watcher.notify(event.src_path)
+                dest = getattr(event, 'dest_path', None)
+                if dest:
+                    watcher.notify(dest)
+
+        observer = Observer()
+        for directory in {os.path.dirname(path) for path in self.jobs_by_input}:
+            observer.schedule(Handler(), directory, recursive=False)
+        observer.daemon = True
+        observer.start()
+
+    def run(self):
+        for path in self.jobs_by_input:
+            self.regenerate(path)
+
+        if Observer is not None:
+            self._start_observer()
+            backend = 'watchdog'
+        else:
+            threading.Thread(target=self._poll, name='watch-poll', daemon=True).start()
+            backend = f'polling every {POLL_INTERVAL * 1000:.0f} ms'
+        print(f"👀 Watching {len(self.jobs_by_input)} input file(s) for {len(self.jobs)} output(s) ({backend}). Ctrl+C to stop.")
+
+        while True:
+            self._wakeup.wait()
+            # Coalesce the burst of events a single save produces.
+            time.sleep(DEBOUNCE_SECONDS)
+            self._wakeup.clear()
+            with self._lock:
+                pending, self._pending = self._pending, set()
+            for path in sorted(pending):
+                if os.path.exists(path):
+                    self.regenerate(path)
+
+
+def parse_jobs(args):
+    """Split ``<converter> <input> <output> [--compact]`` groups into Jobs; None if malformed."""
+    jobs = []
+    i = 0
+    while i < len(args):
+        triple = args[i:i + 3]
+        if len(triple) != 3 or '--compact' in triple:
+            return None
+        i += 3
+        compact = i < len(args) and args[i] == '--compact'
+        if compact:
+            i += 1
+        jobs.append(Job(*triple, compact=compact))
+    return jobs or None
+
+
+def main(jobs):
+    try:
+        Watcher(jobs).run()
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+if __name__ == "__main__":
+    jobs = parse_jobs(sys.argv[1:])
+    if jobs is None:
+        print("Usage: python watch_converters.py <converter> <input> <output> [--compact] [<converter> <input> <output> [--compact] ...]")
+        print(f"Converters: {', '.join(CONVERTERS)}")
+        sys.exit(1)
+    main(jobs)